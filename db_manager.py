@@ -9,20 +9,32 @@ separate table ``CardPrice``. Other card information is stored once in
 from __future__ import annotations
 
 from datetime import date
+import os
 from pathlib import Path
 import re
-from typing import List
+from typing import Dict, Iterable, List, Set, Tuple
 
 from sqlalchemy import (
     create_engine,
     Column,
     Integer,
     String,
-    Date,
     ForeignKey,
+    Index,
+    TypeDecorator,
     UniqueConstraint,
+    bindparam,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
 )
-from sqlalchemy.orm import declarative_base, sessionmaker, Session, relationship
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.elements import BindParameter
 
 from models import Product
 
@@ -31,6 +43,194 @@ __all__ = ["DatabaseManager"]
 Base = declarative_base()
 
 
+class OrdinalDate(TypeDecorator):
+    """Store :class:`datetime.date` values as integer day ordinals.
+
+    Integers avoid parsing ISO date text for every row read and let range
+    filters compare plain numbers.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.toordinal() if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return date.fromordinal(value) if value is not None else None
+
+
+# ``date(1970, 1, 1).toordinal()``; offsets ordinals to days since the epoch.
+_EPOCH_ORDINAL = 719163
+
+# Applied to every new SQLite connection. WAL lets the GUI read while the
+# scraper writes and, with synchronous=NORMAL, avoids an fsync per commit.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+# Characters not allowed in picture file and directory names
+_SAFE_NAME_RE = re.compile(r"[\\/:*?\"<>|]")
+
+# Columns added to ``card`` after the first schema; older database files are
+# upgraded in place with ALTER TABLE.
+_CARD_UPGRADE_COLUMNS = {
+    "feature": "VARCHAR(50) DEFAULT ''",
+    "color": "VARCHAR(50) DEFAULT ''",
+}
+
+# Sources for DatabaseManager.distinct_values. Only cards that have price
+# rows exist, so joining product/rarity to card is enough.
+_DISTINCT_SQL = {
+    "product": "SELECT DISTINCT p.name FROM product p JOIN card c ON c.product_id = p.id",
+    "rarity": "SELECT DISTINCT r.name FROM rarity r JOIN card c ON c.rarity_id = r.id",
+    "card": "SELECT DISTINCT name FROM card",
+    "number": "SELECT DISTINCT number FROM card",
+    "feature": "SELECT DISTINCT feature FROM card",
+    "color": "SELECT DISTINCT color FROM card",
+}
+
+# DataFrame columns returned as pandas categoricals.
+_CATEGORY_COLUMNS = ("product", "card", "number", "rarity", "feature", "color")
+
+# Number of rows pulled from the cursor per DataFrame chunk.
+_FETCH_CHUNKSIZE = 50_000
+
+# DataFrame column -> SQL expression of the price history join, in the
+# default column order.
+_PRICE_HISTORY_COLUMNS = {
+    "product": "p.name",
+    "card": "c.name",
+    "number": "c.number",
+    "rarity": "r.name",
+    "feature": "c.feature",
+    "color": "c.color",
+    "price": "cp.price",
+    "quantity": "cp.quantity",
+    "scraped_at": "cp.scraped_at",
+}
+
+# Flat join used to build the price history DataFrame without going through
+# ORM instances.
+_PRICE_HISTORY_SQL = """
+SELECT {columns}
+FROM card_price cp
+JOIN card c ON cp.card_id = c.id
+JOIN product p ON c.product_id = p.id
+JOIN rarity r ON c.rarity_id = r.id
+{where}
+ORDER BY cp.scraped_at
+"""
+
+# Mean price per card and date for plotting. Card metadata is carried along
+# so the GUI can label lines without a second query. A name can appear in
+# several products, so product, rarity and number all come from one
+# representative card row (the lowest id among the filtered rows).
+_PLOT_DATA_SQL = """
+SELECT g.card AS card,
+       g.scraped_at AS scraped_at,
+       g.price AS price,
+       p.name AS product,
+       r.name AS rarity,
+       c.number AS number
+FROM (
+    SELECT c.name AS card,
+           cp.scraped_at AS scraped_at,
+           AVG(cp.price) AS price,
+           MIN(MIN(c.id)) OVER (PARTITION BY c.name) AS card_id
+    FROM card_price cp
+    JOIN card c ON cp.card_id = c.id
+    JOIN product p ON c.product_id = p.id
+    JOIN rarity r ON c.rarity_id = r.id
+    {where}
+    GROUP BY c.name, cp.scraped_at
+) g
+JOIN card c ON c.id = g.card_id
+JOIN product p ON c.product_id = p.id
+JOIN rarity r ON c.rarity_id = r.id
+ORDER BY g.scraped_at
+"""
+
+
+def _filter_clause(
+    products: Iterable[str] | None = None,
+    rarities: Iterable[str] | None = None,
+    features: Iterable[str] | None = None,
+    colors: Iterable[str] | None = None,
+    number: str | None = None,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> Tuple[str, Dict[str, object], List[BindParameter]]:
+    """Build the ``WHERE`` clause shared by the history queries.
+
+    Empty selections are skipped so they do not filter anything.
+    """
+
+    conditions: List[str] = []
+    params: Dict[str, object] = {}
+    binds: List[BindParameter] = []
+    for name, column, values in (
+        ("products", "p.name", products),
+        ("rarities", "r.name", rarities),
+        ("features", "c.feature", features),
+        ("colors", "c.color", colors),
+    ):
+        values = list(values or ())
+        if values:
+            conditions.append(f"{column} IN :{name}")
+            params[name] = values
+            binds.append(bindparam(name, expanding=True))
+    if number:
+        # Substring match on the card number; LIKE wildcards are escaped.
+        # Matching ids are resolved once against the small card table, then
+        # card_price is read through its card_id index.
+        escaped = re.sub(r"([\\%_])", r"\\\1", number)
+        conditions.append(
+            "cp.card_id IN (SELECT id FROM card WHERE number LIKE :number ESCAPE '\\')"
+        )
+        params["number"] = f"%{escaped}%"
+    if min_price is not None:
+        conditions.append("cp.price >= :min_price")
+        params["min_price"] = min_price
+    if max_price is not None:
+        conditions.append("cp.price <= :max_price")
+        params["max_price"] = max_price
+    if start is not None:
+        conditions.append("cp.scraped_at >= :start")
+        params["start"] = start
+        binds.append(bindparam("start", type_=OrdinalDate))
+    if end is not None:
+        conditions.append("cp.scraped_at <= :end")
+        params["end"] = end
+        binds.append(bindparam("end", type_=OrdinalDate))
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params, binds
+
+
+def _ordinal_to_datetime(pd, ordinals):
+    """Convert a Series of day ordinals to ``datetime64`` values."""
+
+    days = ordinals.astype("int64") - _EPOCH_ORDINAL
+    return pd.to_datetime(days, unit="D").astype("datetime64[ns]")
+
+
+def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+    cursor = dbapi_conn.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 class ProductTable(Base):
     """ORM model for product information."""
 
@@ -56,6 +256,7 @@ class CardTable(Base):
     __tablename__ = "card"
     __table_args__ = (
         UniqueConstraint("product_id", "name", name="uix_product_card_name"),
+        Index("ix_card_product_rarity", "product_id", "rarity_id"),
     )
 
     id: int = Column(Integer, primary_key=True, autoincrement=True)
@@ -75,13 +276,17 @@ class CardPrice(Base):
     __tablename__ = "card_price"
     __table_args__ = (
         UniqueConstraint("card_id", "scraped_at", name="uix_card_price_date"),
+        # Covers the per-card/date aggregation without touching the table
+        Index("ix_cp_card_date_price", "card_id", "scraped_at", "price"),
+        # Date/price range filters that do not narrow down the card first
+        Index("ix_cp_date_price", "scraped_at", "price"),
     )
 
     id: int = Column(Integer, primary_key=True, autoincrement=True)
     card_id: int = Column(Integer, ForeignKey("card.id"), nullable=False)
     price: int = Column(Integer, nullable=False)
     quantity: int = Column(Integer, nullable=False)
-    scraped_at: date = Column(Date, default=date.today, nullable=False)
+    scraped_at: date = Column(OrdinalDate, default=date.today, nullable=False)
 
 
 class DatabaseManager:
@@ -94,117 +299,392 @@ class DatabaseManager:
         # Picture files are stored under <db_dir>/picture/<product>/<card>.jpg
         self.picture_dir = self.base_dir / "picture"
         self.picture_dir.mkdir(exist_ok=True)
-
-        self.engine = create_engine(f"sqlite:///{self.db_path}", echo=False, future=True)
+        # Joined price history cached by fetch_dataframe; its mtime mirrors
+        # the database so a newer DB invalidates it.
+        self.cache_path = self.db_path.with_name(self.db_path.name + ".cache.parquet")
+        # column -> (source mtime, values) for distinct_values()
+        self._distinct_cache: Dict[str, Tuple[float, List[str]]] = {}
+        # (source mtime, DataFrame) of the last unfiltered fetch_dataframe()
+        self._frame_cache: Tuple[float, object] | None = None
+
+        # A small pool shared between the GUI and scraper threads; with WAL
+        # readers keep their connection while a writer holds the lock.
+        self.engine = create_engine(
+            f"sqlite:///{self.db_path}",
+            echo=False,
+            future=True,
+            poolclass=QueuePool,
+            pool_size=4,
+            max_overflow=4,
+            pool_pre_ping=False,
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
         Base.metadata.create_all(self.engine)
+        self._upgrade_schema()
+        # create_all skips tables that already exist, including their
+        # indexes, so make sure indexes added later reach old databases too.
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
         self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False, future=True)
 
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Close all pooled connections; safe to call more than once."""
+
+        self.engine.dispose()
+
+    def __enter__(self) -> "DatabaseManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    def _upgrade_schema(self) -> None:
+        """Bring databases created by older versions up to date."""
+
+        existing = {col["name"] for col in inspect(self.engine).get_columns("card")}
+        missing = [name for name in _CARD_UPGRADE_COLUMNS if name not in existing]
+        with self.engine.begin() as conn:
+            for name in missing:
+                conn.exec_driver_sql(
+                    f"ALTER TABLE card ADD COLUMN {name} {_CARD_UPGRADE_COLUMNS[name]}"
+                )
+            # user_version 1: card_price.scraped_at holds day ordinals instead
+            # of ISO date text. julianday('0001-01-01') is 1721425.5.
+            if conn.exec_driver_sql("PRAGMA user_version").scalar() < 1:
+                conn.exec_driver_sql(
+                    "UPDATE card_price "
+                    "SET scraped_at = CAST(julianday(scraped_at) - 1721424.5 AS INTEGER) "
+                    "WHERE typeof(scraped_at) = 'text'"
+                )
+                conn.exec_driver_sql("PRAGMA user_version = 1")
+
     # ------------------------------------------------------------------
     def insert_products(self, products: List[Product]) -> None:
         """Insert scraped products and related data."""
 
         if not products:
             return
-        with self.SessionLocal() as session:
-            session: Session
+        # One explicit transaction around all bulk inserts so SQLite only
+        # syncs once, when the block commits.
+        with self.engine.begin() as conn:
+            # Preload existing keys once so the loops below only touch
+            # in-memory dicts instead of issuing one query per row.
+            existing_products = self._product_ids(conn)
+            existing_rarities = self._rarity_ids(conn)
+            existing_cards = self._card_ids(conn)
+            # Only the dates being inserted can collide; the scraped_at index
+            # keeps this cheap when products are written one at a time.
+            dates = {card.scraped_at for product in products for card in product.cards}
+            existing_prices = set(
+                conn.execute(
+                    select(CardPrice.card_id, CardPrice.scraped_at).where(
+                        CardPrice.scraped_at.in_(dates)
+                    )
+                ).all()
+            )
+
+            # Rows are collected per table and inserted with one executemany
+            # each. Tables whose ids feed foreign keys are inserted first and
+            # their new ids come back through RETURNING.
+            new_products: List[dict] = []
             for product in products:
-                prod_obj = (
-                    session.query(ProductTable)
-                    .filter_by(name=product.name, url=product.url)
-                    .one_or_none()
+                key = (product.name, product.url)
+                if key not in existing_products:
+                    existing_products[key] = None
+                    new_products.append({"name": product.name, "url": product.url})
+            if new_products:
+                rows = conn.execute(
+                    insert(ProductTable).returning(
+                        ProductTable.name, ProductTable.url, ProductTable.id
+                    ),
+                    new_products,
                 )
-                if prod_obj is None:
-                    prod_obj = ProductTable(name=product.name, url=product.url)
-                    session.add(prod_obj)
-                    session.flush()
+                existing_products.update(((name, url), id_) for name, url, id_ in rows)
 
-                safe_prod = re.sub(r"[\\/:*?\"<>|]", "_", product.name)
+            new_rarities: List[dict] = []
+            for product in products:
+                prod_id = existing_products[(product.name, product.url)]
+                for card in product.cards:
+                    if (prod_id, card.name) in existing_cards:
+                        continue
+                    if card.rarity not in existing_rarities:
+                        existing_rarities[card.rarity] = None
+                        new_rarities.append({"name": card.rarity})
+            if new_rarities:
+                rows = conn.execute(
+                    insert(RarityTable).returning(RarityTable.name, RarityTable.id),
+                    new_rarities,
+                )
+                existing_rarities.update((name, id_) for name, id_ in rows)
+
+            new_cards: List[dict] = []
+            created_dirs: set[Path] = set()
+            for product in products:
+                prod_id = existing_products[(product.name, product.url)]
+                safe_prod = _SAFE_NAME_RE.sub("_", product.name)
                 prod_dir = self.picture_dir / safe_prod
-                prod_dir.mkdir(parents=True, exist_ok=True)
 
                 for card in product.cards:
-                    card_obj = (
-                        session.query(CardTable)
-                        .filter_by(product_id=prod_obj.id, name=card.name)
-                        .one_or_none()
+                    if (prod_id, card.name) in existing_cards:
+                        continue
+                    existing_cards[(prod_id, card.name)] = None
+                    if card.image:
+                        if prod_dir not in created_dirs:
+                            prod_dir.mkdir(parents=True, exist_ok=True)
+                            created_dirs.add(prod_dir)
+                        safe_card = _SAFE_NAME_RE.sub("_", card.name)
+                        file_path = prod_dir / f"{safe_card}.jpg"
+                        # Exclusive create: one open() instead of stat + open
+                        try:
+                            with open(file_path, "xb") as fh:
+                                fh.write(card.image)
+                        except FileExistsError:
+                            pass
+                    new_cards.append(
+                        {
+                            "product_id": prod_id,
+                            "name": card.name,
+                            "rarity_id": existing_rarities[card.rarity],
+                            "url": card.url,
+                            "number": card.number,
+                            "feature": card.feature,
+                            "color": card.color,
+                        }
                     )
-                    if card_obj is None:
-                        rarity_obj = (
-                            session.query(RarityTable)
-                            .filter_by(name=card.rarity)
-                            .one_or_none()
-                        )
-                        if rarity_obj is None:
-                            rarity_obj = RarityTable(name=card.rarity)
-                            session.add(rarity_obj)
-                            session.flush()
-                        if card.image:
-                            safe_card = re.sub(r"[\\/:*?\"<>|]", "_", card.name)
-                            file_path = prod_dir / f"{safe_card}.jpg"
-                            if not file_path.exists():
-                                file_path.write_bytes(card.image)
-
-                        card_obj = CardTable(
-                            product_id=prod_obj.id,
-                            name=card.name,
-                            rarity_id=rarity_obj.id,
-                            url=card.url,
-                            number=card.number,
-                            feature=card.feature,
-                            color=card.color,
-                        )
-                        session.add(card_obj)
-                        session.flush()
+            if new_cards:
+                rows = conn.execute(
+                    insert(CardTable).returning(
+                        CardTable.product_id, CardTable.name, CardTable.id
+                    ),
+                    new_cards,
+                )
+                existing_cards.update(
+                    ((prod_id, name), id_) for prod_id, name, id_ in rows
+                )
 
+            new_prices: List[dict] = []
+            for product in products:
+                prod_id = existing_products[(product.name, product.url)]
+                for card in product.cards:
+                    card_id = existing_cards[(prod_id, card.name)]
                     # Skip insertion when a price for this card was already
                     # recorded on the same date.
-                    existing_price = (
-                        session.query(CardPrice)
-                        .filter_by(card_id=card_obj.id, scraped_at=card.scraped_at)
-                        .first()
+                    price_key = (card_id, card.scraped_at)
+                    if price_key in existing_prices:
+                        continue
+                    existing_prices.add(price_key)
+                    new_prices.append(
+                        {
+                            "card_id": card_id,
+                            "price": card.price,
+                            "quantity": card.quantity,
+                            "scraped_at": card.scraped_at,
+                        }
                     )
-                    if existing_price is None:
-                        session.add(
-                            CardPrice(
-                                card_id=card_obj.id,
-                                price=card.price,
-                                quantity=card.quantity,
-                                scraped_at=card.scraped_at,
-                            )
-                        )
-            session.commit()
-
-    def fetch_dataframe(self):
-        """Return card price history as a pandas DataFrame."""
+            if new_prices:
+                conn.execute(insert(CardPrice), new_prices)
+        self._frame_cache = None
+        self.cache_path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _product_ids(conn: Connection) -> Dict[Tuple[str, str], int]:
+        rows = conn.execute(select(ProductTable.name, ProductTable.url, ProductTable.id))
+        return {(name, url): id_ for name, url, id_ in rows}
+
+    @staticmethod
+    def _rarity_ids(conn: Connection) -> Dict[str, int]:
+        rows = conn.execute(select(RarityTable.name, RarityTable.id))
+        return {name: id_ for name, id_ in rows}
+
+    @staticmethod
+    def _card_ids(conn: Connection) -> Dict[Tuple[int, str], int]:
+        rows = conn.execute(select(CardTable.product_id, CardTable.name, CardTable.id))
+        return {(prod_id, name): id_ for prod_id, name, id_ in rows}
+
+    def known_cards(self) -> Set[Tuple[str, str]]:
+        """Return ``(product name, card name)`` of cards already stored.
+
+        Pictures are written only when insert_products creates a card row,
+        so the scraper can skip downloading images of these cards.
+        """
+
+        stmt = select(ProductTable.name, CardTable.name).join(
+            ProductTable, CardTable.product_id == ProductTable.id
+        )
+        with self.engine.connect() as conn:
+            return {(product, card) for product, card in conn.execute(stmt)}
+
+    def price_ranges(self) -> Tuple[int, int, date, date] | None:
+        """Return ``(min price, max price, first date, last date)`` of all prices.
+
+        ``None`` when no prices are stored. Lets the GUI size its range
+        filters without loading the price history.
+        """
+
+        stmt = select(
+            func.min(CardPrice.price),
+            func.max(CardPrice.price),
+            func.min(CardPrice.scraped_at),
+            func.max(CardPrice.scraped_at),
+        )
+        with self.engine.connect() as conn:
+            row = conn.execute(stmt).one()
+        return None if row[0] is None else tuple(row)
+
+    def card_products(self) -> Dict[str, str]:
+        """Return card name -> name of the first product it was stored under."""
+
+        stmt = (
+            select(CardTable.name, ProductTable.name)
+            .distinct()
+            .join(ProductTable, CardTable.product_id == ProductTable.id)
+            .order_by(CardTable.id)
+        )
+        mapping: Dict[str, str] = {}
+        with self.engine.connect() as conn:
+            for card, product in conn.execute(stmt):
+                mapping.setdefault(card, product)
+        return mapping
+
+    def fetch_dataframe(
+        self,
+        products: Iterable[str] | None = None,
+        rarities: Iterable[str] | None = None,
+        features: Iterable[str] | None = None,
+        colors: Iterable[str] | None = None,
+        number: str | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        columns: Iterable[str] | None = None,
+    ):
+        """Return card price history as a pandas DataFrame.
+
+        The optional arguments are applied as a SQL ``WHERE`` clause so only
+        matching rows are read. ``columns`` limits the selected columns (all
+        by default). Without filters the result is cached in memory and on
+        disk, and later calls are served from the cache as long as it holds
+        every requested column. Text columns are returned as categoricals.
+        """
 
         try:
             import pandas as pd
         except ImportError as err:  # pragma: no cover - optional dependency
             raise RuntimeError("需要 pandas 才能取得 DataFrame") from err
 
-        with self.SessionLocal() as session:
-            data = (
-                session.query(CardPrice, CardTable, ProductTable, RarityTable)
-                .join(CardTable, CardPrice.card_id == CardTable.id)
-                .join(ProductTable, CardTable.product_id == ProductTable.id)
-                .join(RarityTable, CardTable.rarity_id == RarityTable.id)
-                .order_by(CardPrice.scraped_at)
-                .all()
-            )
-            df = pd.DataFrame(
-                [
-                    {
-                        "product": prod.name,
-                        "card": card.name,
-                        "number": card.number,
-                        "rarity": rarity.name,
-                        "feature": card.feature,
-                        "color": card.color,
-                        "price": price.price,
-                        "quantity": price.quantity,
-                        "scraped_at": price.scraped_at,
-                    }
-                    for price, card, prod, rarity in data
-                ]
-            )
+        where, params, binds = _filter_clause(
+            products, rarities, features, colors, number, min_price, max_price, start, end
+        )
+        use_cache = not where
+        columns = list(_PRICE_HISTORY_COLUMNS if columns is None else columns)
+        # The cache always holds every column so a narrow call never leaves
+        # behind a partial frame that the next full call has to rebuild.
+        query_columns = list(_PRICE_HISTORY_COLUMNS) if use_cache else columns
+        column_list = ",\n       ".join(
+            f"{_PRICE_HISTORY_COLUMNS[c]} AS {c}" for c in query_columns
+        )
+
+        source_mtime = self._source_mtime()
+        if use_cache:
+            cached = self._frame_cache
+            # Repeated refreshes of an unchanged database skip even the
+            # parquet read; selecting columns returns a copy.
+            if cached is not None and cached[0] == source_mtime:
+                if set(columns) <= set(cached[1].columns):
+                    return cached[1][columns]
+            try:
+                if self.cache_path.stat().st_mtime >= source_mtime:
+                    df = pd.read_parquet(self.cache_path, columns=columns)
+                    self._frame_cache = (source_mtime, df)
+                    return df[columns]
+            except (OSError, ImportError, ValueError):
+                pass
+
+        # Read in bounded chunks so the cursor never buffers the whole
+        # result alongside the DataFrame being built. Text columns become
+        # categoricals per chunk; sharing one dtype keeps concat cheap.
+        dtype = {c: "int32" for c in ("price", "quantity") if c in query_columns}
+        for column in _CATEGORY_COLUMNS:
+            if column in query_columns:
+                dtype[column] = pd.CategoricalDtype(self.distinct_values(column))
+        chunks = pd.read_sql_query(
+            text(_PRICE_HISTORY_SQL.format(columns=column_list, where=where)).bindparams(*binds),
+            self.engine,
+            params=params,
+            dtype=dtype,
+            chunksize=_FETCH_CHUNKSIZE,
+        )
+        df = pd.concat(chunks, ignore_index=True)
+        if "scraped_at" in query_columns:
+            df["scraped_at"] = _ordinal_to_datetime(pd, df["scraped_at"])
+        if not use_cache:
             return df
+
+        self._frame_cache = (source_mtime, df)
+        try:
+            df.to_parquet(self.cache_path, compression="zstd")
+            # Stamp the cache with the mtime seen before the query so a
+            # write that lands while we were reading still invalidates it.
+            os.utime(self.cache_path, (source_mtime, source_mtime))
+        except (OSError, ImportError):  # pragma: no cover - pyarrow missing
+            self.cache_path.unlink(missing_ok=True)
+        return df[columns]
+
+    def fetch_plot_data(self, **filters):
+        """Return the mean price per card and date as a DataFrame.
+
+        ``filters`` accepts the same keyword arguments as
+        :meth:`fetch_dataframe`. Aggregation happens in SQLite so only one
+        row per plotted point is read.
+        """
+
+        try:
+            import pandas as pd
+        except ImportError as err:  # pragma: no cover - optional dependency
+            raise RuntimeError("需要 pandas 才能取得 DataFrame") from err
+
+        where, params, binds = _filter_clause(**filters)
+        df = pd.read_sql_query(
+            text(_PLOT_DATA_SQL.format(where=where)).bindparams(*binds),
+            self.engine,
+            params=params,
+        )
+        df["scraped_at"] = _ordinal_to_datetime(pd, df["scraped_at"])
+        return df
+
+    def distinct_values(self, column: str) -> List[str]:
+        """Return the sorted distinct non-null values of ``column``.
+
+        ``column`` is one of the DataFrame column names (``product``,
+        ``rarity``, ``card``, ``number``, ``feature`` or ``color``). Results are
+        memoised until the database file changes.
+        """
+
+        sql = _DISTINCT_SQL[column]
+        stamp = self._source_mtime()
+        cached = self._distinct_cache.get(column)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with self.engine.connect() as conn:
+            values = [
+                str(v) for (v,) in conn.exec_driver_sql(f"{sql} ORDER BY 1") if v is not None
+            ]
+        self._distinct_cache[column] = (stamp, values)
+        return values
+
+    def _source_mtime(self) -> float:
+        """Return the newest mtime of the DB file and its WAL."""
+
+        mtimes = [0.0]
+        for path in (self.db_path, self.db_path.with_name(self.db_path.name + "-wal")):
+            try:
+                mtimes.append(path.stat().st_mtime)
+            except OSError:
+                pass
+        return max(mtimes)
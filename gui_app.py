@@ -10,34 +10,19 @@ menus.
 """
 from __future__ import annotations
 
+import importlib.util
 import sys, os, platform
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 import re
 
-import pandas as pd
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-
-# Use a font that supports CJK characters so card names display correctly
-plt.rcParams["font.family"] = "sans-serif"
-plt.rcParams["font.sans-serif"] = [
-    "Noto Sans CJK JP",
-    "Microsoft JhengHei",
-    "SimHei",
-    "Source Han Sans",
-    "Arial Unicode MS",
-    "DejaVu Sans",
-]
-plt.rcParams["axes.unicode_minus"] = False
 from PyQt5.QtWidgets import (
-    QApplication,
     QMainWindow,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QListWidget,
-    QListWidgetItem,
     QComboBox,
     QLineEdit,
     QCompleter,
@@ -51,7 +36,7 @@ from PyQt5.QtWidgets import (
     QDialogButtonBox,
 )
 from PyQt5 import QtCore
-from PyQt5.QtCore import QDate
+from PyQt5.QtCore import QDate, QObject, QStringListModel, QThread, QTimer, pyqtSignal
 from PyQt5.QtCore import QLibraryInfo
 from PyQt5.QtGui import QPixmap
 
@@ -60,8 +45,119 @@ from db_manager import DatabaseManager
 from dotenv import load_dotenv
 load_dotenv(Path(__file__).with_name('.env'))
 
+# pandas, NumPy and matplotlib are imported once the window is in use. Check
+# for them here so a missing one still fails the gui_app import, which
+# app.py reports instead of a traceback from StatsWindow().
+for _module in ("numpy", "pandas", "matplotlib"):
+    if importlib.util.find_spec(_module) is None:  # pragma: no cover - optional dependency
+        raise ImportError(f"{_module} is required for the GUI", name=_module)
+
+if TYPE_CHECKING:  # pragma: no cover - annotations only
+    import numpy as np
+    from matplotlib.collections import LineCollection, PathCollection
+
 __all__ = ["StatsWindow", "launch_gui"]
 
+# Characters replaced in picture paths; must match db_manager.insert_products
+_SAFE_NAME_RE = re.compile(r"[\\/:*?\"<>|]")
+
+
+def _configure_matplotlib() -> None:
+    """Import matplotlib on first use and select CJK-capable fonts."""
+    import matplotlib.pyplot as plt
+
+    # Use a font that supports CJK characters so card names display correctly
+    plt.rcParams["font.family"] = "sans-serif"
+    plt.rcParams["font.sans-serif"] = [
+        "Noto Sans CJK JP",
+        "Microsoft JhengHei",
+        "SimHei",
+        "Source Han Sans",
+        "Arial Unicode MS",
+        "DejaVu Sans",
+    ]
+    plt.rcParams["axes.unicode_minus"] = False
+
+
+@lru_cache(maxsize=64)
+def _load_pixmap(path: str) -> QPixmap:
+    """Decode ``path`` once; pictures are never rewritten in place."""
+    return QPixmap(path)
+
+
+def _m4_mark(t, y, n_bins, span, keep) -> None:
+    """Flag the first, last, min and max index of each bin in ``keep``.
+
+    Single pass over a time-sorted series; compiled by :func:`_m4_kernel`.
+    Ties pick the same points as the NumPy path in :func:`_m4_downsample`.
+    """
+    n = len(t)
+    current = -1
+    first = low = high = 0
+    for i in range(n):
+        b = int((t[i] - t[0]) / span * n_bins)
+        if b > n_bins - 1:
+            b = n_bins - 1
+        if b != current:
+            if current >= 0:
+                keep[first] = True
+                keep[i - 1] = True
+                keep[low] = True
+                keep[high] = True
+            current = b
+            first = low = high = i
+        else:
+            if y[i] < y[low]:
+                low = i
+            if y[i] >= y[high]:
+                high = i
+    keep[first] = True
+    keep[n - 1] = True
+    keep[low] = True
+    keep[high] = True
+
+
+@lru_cache(maxsize=None)
+def _m4_kernel():
+    """Return :func:`_m4_mark` compiled with numba, or ``None`` without it."""
+    try:
+        from numba import njit
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return njit(cache=True, nogil=True)(_m4_mark)
+
+
+def _m4_downsample(x, y, n_bins: int):
+    """Reduce a time-sorted series with the M4 algorithm.
+
+    Keeps the first, last, minimum and maximum point of each of ``n_bins``
+    equal-width x bins, which renders identically to the full series at a
+    width of ``n_bins`` pixels. Series that are already small enough are
+    returned unchanged.
+    """
+    import numpy as np
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if n_bins <= 0 or len(x) <= 4 * n_bins:
+        return x, y
+    t = x.astype("int64")
+    # Float maths: nanosecond offsets times n_bins overflow int64
+    span = float(t[-1] - t[0]) or 1.0
+    kernel = _m4_kernel()
+    if kernel is not None:
+        keep = np.zeros(len(t), dtype=bool)
+        kernel(t, y, n_bins, span, keep)
+        return x[keep], y[keep]
+    bins = np.minimum(((t - t[0]) / span * n_bins).astype("int64"), n_bins - 1)
+    first = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    last = np.r_[first[1:] - 1, len(t) - 1]
+    # Sorting by (bin, y) keeps the bin boundaries, so the first/last
+    # position of each bin in ``order`` is that bin's min/max point.
+    order = np.lexsort((y, bins))
+    keep = np.unique(np.concatenate([first, last, order[first], order[last]]))
+    return x[keep], y[keep]
+
 
 class SettingsDialog(QDialog):
     """Dialog for selecting how many curves to display."""
@@ -95,11 +191,41 @@ class SettingsDialog(QDialog):
         return self.mode_box.currentText(), self.count_box.value()
 
 
+class LoaderWorker(QObject):
+    """Fetch the price table and filter choices off the UI thread."""
+
+    loaded = pyqtSignal(object)
+
+    def __init__(self, db: DatabaseManager) -> None:
+        super().__init__()
+        self.db = db
+
+    def run(self) -> None:
+        # Only what the window reads: ranges and the card -> product map,
+        # both aggregated in SQLite instead of loading the price history
+        ranges = self.db.price_ranges()
+        card_products = self.db.card_products()
+        choices = {
+            column: self.db.distinct_values(column)
+            for column in ("product", "rarity", "color", "number")
+        }
+        self.loaded.emit((ranges, card_products, choices))
+
+
 class StatsWindow(QMainWindow):
     """Simple statistics viewer with filter options."""
 
+    _load_requested = pyqtSignal()
+
     def __init__(self, db_path: str = "scraped_data.db") -> None:
         super().__init__()
+        # matplotlib is only imported once a window is created
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.collections import LineCollection
+
+        _configure_matplotlib()
+
         self.db_path = db_path
         self.db = DatabaseManager(db_path=db_path)
         self.setWindowTitle("Card Price Stats")
@@ -108,6 +234,24 @@ class StatsWindow(QMainWindow):
         self.figure, self.ax = plt.subplots()
         self.canvas = FigureCanvas(self.figure)
         self.canvas.mpl_connect("pick_event", self._on_pick)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        # All cards share one LineCollection and one marker scatter; the
+        # pick index maps back to a card through _line_cards.
+        self.ax.xaxis_date()
+        self._lines: LineCollection = LineCollection([], picker=True, animated=True)
+        self.ax.add_collection(self._lines)
+        self._markers: PathCollection = self.ax.scatter([], [], s=36, animated=True)
+        self._line_cards: list[str] = []
+        self._card_colors: dict[str, str] = {}
+        self._palette = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        # Both are animated: full draws render only the static background,
+        # which is kept so data-only updates can be blitted over it.
+        self._background = None
+        self._blit_state: tuple | None = None
+        # card -> (dates, mean prices) for the current non-range filters
+        self._series: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._series_labels: dict[str, str] = {}
+        self._series_key: tuple | None = None
 
         self.image_label = QLabel("No image")
         self.image_label.setAlignment(QtCore.Qt.AlignCenter)
@@ -131,6 +275,12 @@ class StatsWindow(QMainWindow):
         self.color_list = self._create_combo_box()
         self.number_edit = QLineEdit()
         self.number_edit.setMinimumWidth(150)
+        # Completer for card number entry; the model is refilled on load
+        self._number_model = QStringListModel(self)
+        completer = QCompleter(self._number_model, self)
+        completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        completer.setFilterMode(QtCore.Qt.MatchContains)
+        self.number_edit.setCompleter(completer)
 
         self.min_price = QSpinBox()
         self.max_price = QSpinBox()
@@ -146,6 +296,21 @@ class StatsWindow(QMainWindow):
         self.refresh_btn.clicked.connect(self.load_data)
         self.plot_btn.clicked.connect(self.update_plot)
 
+        # Filter edits replot through a single-shot timer so a burst of
+        # changes (typing, spinning) results in one redraw.
+        self._replot_timer = QTimer(self)
+        self._replot_timer.setSingleShot(True)
+        self._replot_timer.setInterval(150)
+        self._replot_timer.timeout.connect(self.update_plot)
+        self.product_list.itemSelectionChanged.connect(self._schedule_replot)
+        for box in (self.rarity_list, self.color_list):
+            box.currentIndexChanged.connect(self._schedule_replot)
+        self.number_edit.textChanged.connect(self._schedule_replot)
+        for spin in (self.min_price, self.max_price):
+            spin.valueChanged.connect(self._schedule_replot)
+        for edit in (self.start_date, self.end_date):
+            edit.dateChanged.connect(self._schedule_replot)
+
         # Left side - product filter
         left_layout = QVBoxLayout()
         left_layout.addWidget(QLabel("Product"))
@@ -219,7 +384,17 @@ class StatsWindow(QMainWindow):
         main_layout.setStretch(1, 1)
         self.setCentralWidget(central)
 
-        self.df: pd.DataFrame = pd.DataFrame()
+        # (min price, max price, first date, last date); None for an empty DB
+        self._price_ranges: tuple | None = None
+        self._card_to_product: dict[str, str] = {}
+
+        # SQLite reads run in a worker thread so the window stays responsive
+        self._loader_thread = QThread(self)
+        self._loader = LoaderWorker(self.db)
+        self._loader.moveToThread(self._loader_thread)
+        self._loader.loaded.connect(self._on_data_loaded)
+        self._load_requested.connect(self._loader.run)
+        self._loader_thread.start()
         self.load_data()
 
     # ------------------------------------------------------------------
@@ -248,48 +423,69 @@ class StatsWindow(QMainWindow):
 
     # ------------------------------------------------------------------
     def load_data(self) -> None:
-        """Load data from the database and populate filter widgets."""
-        self.df = self.db.fetch_dataframe()
+        """Ask the loader thread to re-read the database."""
+        self.refresh_btn.setEnabled(False)
+        self._load_requested.emit()
 
-        for widget, column in [
-            (self.product_list, "product"),
-            (self.rarity_list, "rarity"),
-            (self.color_list, "color"),
+    # ------------------------------------------------------------------
+    def _on_data_loaded(self, payload: tuple) -> None:
+        """Populate filter widgets with the data fetched by :class:`LoaderWorker`."""
+        self._price_ranges, self._card_to_product, choices = payload
+        self.refresh_btn.setEnabled(True)
+
+        products = choices["product"]
+        for widget, values in [
+            (self.product_list, products),
+            (self.rarity_list, choices["rarity"]),
+            (self.color_list, choices["color"]),
         ]:
+            # One addItems() call per widget; signals are blocked and
+            # painting paused so the rebuild is neither announced nor
+            # repainted item by item.
+            widget.setUpdatesEnabled(False)
+            widget.blockSignals(True)
             widget.clear()
-            values = [str(v) for v in sorted(self.df[column].dropna().unique())]
             if isinstance(widget, QListWidget):
-                for value in values:
-                    QListWidgetItem(value, widget)
+                widget.addItems(values)
             elif isinstance(widget, QComboBox):
-                widget.addItem("")
-                for value in values:
-                    widget.addItem(value)
+                widget.addItems([""] + values)
+            widget.blockSignals(False)
+            widget.setUpdatesEnabled(True)
 
         # Fixed width for product list based on longest item
-        if not self.df.empty:
+        if products:
+            longest = max(products, key=len)
             metrics = self.product_list.fontMetrics()
-            products = [str(v) for v in sorted(self.df["product"].dropna().unique())]
-            if products:
-                width = max(metrics.boundingRect(p).width() for p in products) + 20
-                self.product_list.setFixedWidth(width)
-
-        # Completer for card number entry
-        numbers = [str(v) for v in sorted(self.df["number"].dropna().unique())]
-        completer = QCompleter(numbers)
-        completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
-        completer.setFilterMode(QtCore.Qt.MatchContains)
-        self.number_edit.setCompleter(completer)
-
-        if not self.df.empty:
-            self.min_price.setValue(int(self.df["price"].min()))
-            self.max_price.setValue(int(self.df["price"].max()))
-            min_date = self.df["scraped_at"].min()
-            max_date = self.df["scraped_at"].max()
+            width = metrics.boundingRect(longest).width() + 20
+            self.product_list.setFixedWidth(width)
+
+        # Only reset the completer model when the numbers actually changed
+        numbers = choices["number"]
+        if numbers != self._number_model.stringList():
+            self._number_model.setStringList(numbers)
+
+        if self._price_ranges is not None:
+            low, high, min_date, max_date = self._price_ranges
+            self.min_price.setValue(low)
+            self.max_price.setValue(high)
             self.start_date.setDate(QDate(min_date.year, min_date.month, min_date.day))
             self.end_date.setDate(QDate(max_date.year, max_date.month, max_date.day))
 
+        self._series_key = None
         self.update_plot()
+        # Setting the ranges above queued a replot that is now redundant
+        self._replot_timer.stop()
+
+    # ------------------------------------------------------------------
+    def closeEvent(self, event) -> None:
+        self._loader_thread.quit()
+        self._loader_thread.wait()
+        super().closeEvent(event)
+
+    # ------------------------------------------------------------------
+    def _schedule_replot(self, *_args) -> None:
+        """(Re)start the debounce timer; signal arguments are ignored."""
+        self._replot_timer.start()
 
     # ------------------------------------------------------------------
     def _selected_values(self, widget: QWidget) -> Iterable[str]:
@@ -303,28 +499,25 @@ class StatsWindow(QMainWindow):
     # ------------------------------------------------------------------
     def _get_image_path(self, product: str, card_name: str) -> Path:
         """Return the image file path for the given product/card."""
-        safe_prod = re.sub(r"[\\/:*?\"<>|]", "_", product)
-        safe_card = re.sub(r"[\\/:*?\"<>|]", "_", card_name)
+        safe_prod = _SAFE_NAME_RE.sub("_", product)
+        safe_card = _SAFE_NAME_RE.sub("_", card_name)
         base = Path(self.db_path).parent
         return base / "picture" / safe_prod / f"{safe_card}.jpg"
 
     # ------------------------------------------------------------------
     def _on_pick(self, event) -> None:
-        line = getattr(event, "artist", None)
-        if line is None:
+        if event.artist is not self._lines or not len(event.ind):
             return
-        card_name = getattr(line, "card_name", "")
-        if not card_name:
-            return
-        df = self.df[self.df["card"] == card_name]
-        if df.empty:
+        card_name = self._line_cards[event.ind[0]]
+        product = self._card_to_product.get(card_name)
+        if product is None:
             self.image_label.setText("No image")
             self.image_label.setPixmap(QPixmap())
             return
-        product = str(df.iloc[0]["product"])
         img_path = self._get_image_path(product, card_name)
-        if img_path.is_file():
-            self.image_label.setPixmap(QPixmap(str(img_path)))
+        pixmap = _load_pixmap(str(img_path)) if img_path.is_file() else None
+        if pixmap is not None and not pixmap.isNull():
+            self.image_label.setPixmap(pixmap)
             self.image_label.setText("")
         else:
             self.image_label.setPixmap(QPixmap())
@@ -344,82 +537,159 @@ class StatsWindow(QMainWindow):
         self.update_plot()
 
     # ------------------------------------------------------------------
-    def update_plot(self) -> None:
-        """Filter ``self.df`` based on UI selections and update the chart."""
-        if self.df.empty:
-            return
-
-        df = self.df.copy()
-
-        selections = self._selected_values(self.product_list)
-        if selections:
-            df = df[df["product"].isin(selections)]
+    def _load_series(self, key: tuple) -> None:
+        """Fetch per-card price series for the non-range filters in ``key``."""
+        import numpy as np
 
-        selections = self._selected_values(self.rarity_list)
-        if selections:
-            df = df[df["rarity"].isin(selections)]
-
-        number_text = self.number_edit.text().strip()
-        if number_text:
-            df = df[df["number"].str.contains(number_text, na=False)]
+        products, rarities, colors, number = key
+        grouped = self.db.fetch_plot_data(
+            products=products, rarities=rarities, colors=colors, number=number or None
+        )
+        self._series = {}
+        self._series_labels = {}
+        for card_name, data in grouped.groupby("card", observed=True, sort=False):
+            first = data.iloc[0]
+            self._series[card_name] = (
+                data["scraped_at"].to_numpy().astype("datetime64[D]"),
+                data["price"].to_numpy().astype(np.float32),
+            )
+            self._series_labels[card_name] = (
+                f"{first['product']} {first['rarity']} {first['number']}".strip()
+            )
+        self._series_key = key
 
-        selections = self._selected_values(self.color_list)
-        if selections:
-            df = df[df["color"].isin(selections)]
+    # ------------------------------------------------------------------
+    def update_plot(self) -> None:
+        """Query rows matching the UI selections and update the chart."""
+        import numpy as np
 
-        df = df[(df["price"] >= self.min_price.value()) & (df["price"] <= self.max_price.value())]
+        if self._price_ranges is None:
+            return
 
-        start = self.start_date.date().toPyDate()
-        end = self.end_date.date().toPyDate()
-        df = df[(df["scraped_at"] >= start) & (df["scraped_at"] <= end)]
+        # Product/rarity/color/number changes need a new query; the price
+        # and date ranges are applied to the cached per-card arrays.
+        key = (
+            tuple(self._selected_values(self.product_list)),
+            tuple(self._selected_values(self.rarity_list)),
+            tuple(self._selected_values(self.color_list)),
+            self.number_edit.text().strip(),
+        )
+        if key != self._series_key:
+            self._load_series(key)
+
+        start = np.datetime64(self.start_date.date().toPyDate(), "D")
+        end = np.datetime64(self.end_date.date().toPyDate(), "D")
+        min_price = self.min_price.value()
+        max_price = self.max_price.value()
+        selected: dict[str, tuple] = {}
+        for card_name, (times, prices) in self._series.items():
+            lo = np.searchsorted(times, start, side="left")
+            hi = np.searchsorted(times, end, side="right")
+            times, prices = times[lo:hi], prices[lo:hi]
+            keep = (prices >= min_price) & (prices <= max_price)
+            if keep.any():
+                selected[card_name] = (times[keep], prices[keep])
 
-        self.ax.clear()
-        if df.empty:
+        if self.show_top_n:
+            largest = self.show_top_mode == "大"
+            score = {
+                card: (p.max() if largest else p.min()) for card, (_, p) in selected.items()
+            }
+            top_cards = sorted(score, key=score.get, reverse=largest)[: self.show_top_n]
+            selected = {card: selected[card] for card in top_cards}
+
+        if not selected:
+            self._set_lines([], [], [])
             self.ax.set_title("No data")
-            self.canvas.draw()
+            self._blit_state = None
+            self._background = None
+            self.canvas.draw_idle()
             return
 
-        grouped = df.groupby(["card", "scraped_at"])["price"].mean().reset_index()
-        meta = (
-            df[["card", "rarity", "number", "product"]]
-            .drop_duplicates(subset=["card"])
-            .set_index("card")
-        )
+        import matplotlib.dates as mdates
+        from matplotlib.lines import Line2D
+
+        cards = sorted(selected)
+        # A card keeps the colour it was first drawn with across refreshes
+        palette = self._palette
+        for card in cards:
+            if card not in self._card_colors:
+                self._card_colors[card] = palette[len(self._card_colors) % len(palette)]
+        colors = [self._card_colors[card] for card in cards]
+        width_px = int(self.canvas.width())
+        segments = []
+        for card_name in cards:
+            x, y = _m4_downsample(*selected[card_name], width_px)
+            segments.append(np.column_stack([mdates.date2num(x), y]))
+        self._set_lines(cards, segments, colors)
+
+        points = np.concatenate(segments)
+        self.ax.ignore_existing_data_limits = True
+        self.ax.update_datalim(points)
+        self.ax.autoscale_view()
+        # Axes limits and legend entries are part of the saved background;
+        # if neither changed only the lines need repainting.
+        legend_labels = None
+        if len(cards) <= 10:
+            legend_labels = tuple(self._series_labels[card] for card in cards)
+        blit_state = (self.ax.get_xlim(), self.ax.get_ylim(), legend_labels, tuple(colors))
+        if self._background is not None and blit_state == self._blit_state:
+            self.canvas.restore_region(self._background)
+            self._draw_lines()
+            self.canvas.blit(self.figure.bbox)
+            return
 
-        if self.show_top_n:
-            agg = grouped.groupby("card")["price"]
-            series = agg.max() if self.show_top_mode == "大" else agg.min()
-            asc = self.show_top_mode == "小"
-            top_cards = set(series.sort_values(ascending=asc).head(self.show_top_n).index)
-            grouped = grouped[grouped["card"].isin(top_cards)]
-            meta = meta.loc[meta.index.intersection(top_cards)]
-
-        line_count = 0
-        for card_name, data in grouped.groupby("card"):
-            rarity = meta.loc[card_name, "rarity"] if card_name in meta.index else ""
-            number = meta.loc[card_name, "number"] if card_name in meta.index else ""
-            product = meta.loc[card_name, "product"] if card_name in meta.index else ""
-            label = f"{product} {rarity} {number}".strip()
-            line = self.ax.plot(
-                data["scraped_at"],
-                data["price"],
-                marker="o",
-                label=label,
-            )[0]
-            line.set_picker(True)
-            line.card_name = card_name
-            line_count += 1
-
-        if line_count <= 10:
-            self.ax.legend()
+        legend = self.ax.get_legend()
+        if legend_labels is not None:
+            handles = [
+                Line2D([], [], color=color, marker="o", label=label)
+                for color, label in zip(colors, legend_labels)
+            ]
+            self.ax.legend(handles=handles)
+        elif legend is not None:
+            legend.remove()
+        self.ax.set_title("")
         self.ax.set_xlabel("Date")
         self.ax.set_ylabel("Price")
         self.figure.autofmt_xdate()
-        self.canvas.draw()
+        self._blit_state = blit_state
+        # Stale until the pending full draw captures a new one
+        self._background = None
+        self.canvas.draw_idle()
+
+    # ------------------------------------------------------------------
+    def _set_lines(self, cards: list[str], segments: list, colors: list) -> None:
+        """Replace the plotted cards and drop a stale legend when empty."""
+        import numpy as np
+
+        self._line_cards = cards
+        self._lines.set_segments(segments)
+        if segments:
+            self._lines.set_color(colors)
+            sizes = [len(segment) for segment in segments]
+            self._markers.set_offsets(np.concatenate(segments))
+            self._markers.set_color(np.repeat(self._lines.get_colors(), sizes, axis=0))
+        else:
+            self._markers.set_offsets(np.empty((0, 2)))
+            if self.ax.get_legend() is not None:
+                self.ax.get_legend().remove()
+
+    # ------------------------------------------------------------------
+    def _on_draw(self, _event) -> None:
+        """Save the freshly drawn background and paint the lines over it."""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_lines()
+
+    # ------------------------------------------------------------------
+    def _draw_lines(self) -> None:
+        self.ax.draw_artist(self._lines)
+        self.ax.draw_artist(self._markers)
 
 
 def launch_gui(db_path: str) -> None:
     """Convenience function to launch :class:`StatsWindow`."""
+    from PyQt5.QtWidgets import QApplication
+
     app = QApplication(sys.argv)
     win = StatsWindow(db_path)
     win.show()
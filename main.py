@@ -8,9 +8,13 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import threading
 from pathlib import Path
-from typing import Callable
+from queue import Queue
+from typing import Callable, List
 
+from models import Product
 from scraper import Scraper
 from db_manager import DatabaseManager
 
@@ -23,16 +27,52 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
 
 def create_job(url: str, db_path: str) -> Callable[[], None]:
-    """Closure：返回實際執行爬蟲的函式。"""
+    """Closure：返回實際執行爬蟲的函式。
+
+    Scraper（含瀏覽器與連線池）與 DatabaseManager 都只建立一次，
+    每次執行 job 都重複使用，並於程式結束時關閉，不依賴 ``__del__``。
+    """
+    # HTTP 快取與資料庫放在同一目錄，不寫入目前工作目錄
+    db_file = Path(db_path)
+    scr = Scraper(url, http_cache=str(db_file.with_name(db_file.name + ".scrape_cache")))
+    atexit.register(scr.close)
+    db = DatabaseManager(db_path)
+    atexit.register(db.close)
 
     def job():
-        scr = Scraper(url)
+        scr.known_cards = db.known_cards()
         html = scr.fetch()
-        data = scr.parse(html)
-        if data:
-            db = DatabaseManager(db_path)
-            db.insert_products(data)
-            print(f"[✓] {len(data)} records inserted.")
+        # 解析與寫入管線化：寫入執行緒寫入已完成的產品時，爬蟲繼續處理下一個
+        queue: Queue[Product | None] = Queue(maxsize=4)
+        errors: List[Exception] = []
+
+        def writer() -> None:
+            while (product := queue.get()) is not None:
+                if errors:
+                    continue  # 仍須取出剩餘項目，避免爬蟲端卡在 put()
+                try:
+                    db.insert_products([product])
+                except Exception as err:
+                    errors.append(err)
+
+        thread = threading.Thread(target=writer, name="db-writer", daemon=True)
+        thread.start()
+        count = 0
+        products = scr.iter_parse(html)
+        try:
+            for product in products:
+                if errors:
+                    break  # 寫入已失敗，不再繼續爬取，盡快拋出錯誤
+                queue.put(product)
+                count += 1
+        finally:
+            products.close()
+            queue.put(None)
+            thread.join()
+        if errors:
+            raise errors[0]
+        if count:
+            print(f"[✓] {count} records inserted.")
         else:
             print("[!] No data scraped – check selectors?")
 
@@ -9,7 +9,7 @@ from typing import List
 __all__ = ["Card", "Product"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Card:
     """Represents a single card item scraped from the website."""
 
@@ -25,7 +25,7 @@ class Card:
     color: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Represents a product containing multiple cards."""
 
@@ -9,16 +9,25 @@
 """
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import io
+import multiprocessing as mp
+import os
 import re
-from typing import List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
 from datetime import date
+from urllib.parse import urlsplit
 
 from models import Product, Card
 
 import time
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -26,21 +35,471 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 
+# Playwright 可用時取代 Selenium，並封鎖圖片/CSS 等解析用不到的資源
+try:
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.sync_api import sync_playwright
+except ImportError:  # pragma: no cover - optional dependency
+    sync_playwright = None
+
+# Pillow 可用時將卡圖縮成側欄大小再存檔
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+# lxml 為 C 實作，解析速度遠勝內建 html.parser；未安裝時退回內建解析器
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    _HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - optional dependency
+    lxml_html = None
+    _HTML_PARSER = "html.parser"
+
+# httpx 可用時以非同步連線池並行下載單卡頁面；HTTP/2 需另裝 h2
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# 磁碟 HTTP 快取：requests 用 requests-cache，httpx 用 hishel；皆可省略
+try:
+    import requests_cache
+except ImportError:  # pragma: no cover - optional dependency
+    requests_cache = None
+try:
+    import anysqlite  # noqa: F401  hishel 的非同步 SQLite 儲存需要
+    import hishel
+    from hishel.httpx import AsyncCacheTransport
+except ImportError:  # pragma: no cover - optional dependency
+    hishel = None
+
+# 與 requests Session 的 Retry 設定一致
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+_RETRY_TOTAL = 3
+
+# selectolax (Lexbor) 解析單卡頁面可比 BeautifulSoup 快一個數量級
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
 __all__ = ["Scraper"]
 
+# 首頁只需 tab-content 內的按鈕，其餘 DOM 不建立節點
+_INDEX_STRAINER = SoupStrainer("div", class_="tab-content")
+# 產品頁只需卡片列表區塊，單卡頁只需 product-detail 區塊
+_PRODUCT_STRAINER = SoupStrainer("div", class_="col-12 mb-5 pb-5")
+_CARD_STRAINER = SoupStrainer("section", id="product-detail")
+
+
+def _has_class(name: str) -> str:
+    """XPath 條件：``@class`` 含有 ``name`` 這個 token (等同 CSS ``.name``)。"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 等同 parse() 原本的 CSS 選擇器，並在 XPath 內排除 #side-sell-target-11
+_INDEX_BUTTONS_XPATH = (
+    f"//div[{_has_class('tab-content')}]"
+    f"//div[{_has_class('accordion')} and {_has_class('accordion-flush')}]"
+    "//div[@id='side-sell-single']"
+    f"//h2[{_has_class('accordion-header')}]/button[@onclick]"
+    "[not(ancestor::*[@id='side-sell-target-11'])]"
+)
+
+# 首頁產品按鈕：(按鈕文字, onclick 屬性)
+_IndexButton = tuple[str, str]
+
+
+def _index_buttons_soup(html: str) -> List[_IndexButton]:
+    soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_INDEX_STRAINER)
+    buttons: List[_IndexButton] = []
+    # 排除區塊內的按鈕先收集一次，省去每個按鈕往上走訪祖先
+    excluded = {
+        id(btn)
+        for target in soup.select("#side-sell-target-11")
+        for btn in target.select("button[onclick]")
+    }
+    for div in soup.select("div.tab-content div.accordion.accordion-flush"):
+        for btn in div.select(
+            "div#side-sell-single h2.accordion-header > button[onclick]"
+        ):
+            if id(btn) in excluded:
+                continue
+            buttons.append((btn.get_text(strip=True), btn.get("onclick", "")))
+    return buttons
+
+
+def _index_buttons_lxml(html: str) -> List[_IndexButton]:
+    """直接走訪 lxml 元素，省去 BeautifulSoup 包裝每個節點的成本。"""
+    try:
+        root = lxml_html.fromstring(html)
+    except etree.ParserError:  # 空白頁面
+        return []
+    return [
+        # 與 get_text(strip=True) 相同：各段文字去空白後串接
+        ("".join(t.strip() for t in btn.xpath(".//text()")), btn.get("onclick", ""))
+        for btn in root.xpath(_INDEX_BUTTONS_XPATH)
+    ]
+
+
+_index_buttons = _index_buttons_lxml if lxml_html is not None else _index_buttons_soup
+
+# 卡圖縮圖上限 (寬, 高)；GUI 側欄顯示約為此大小
+_THUMBNAIL_SIZE = (240, 336)
+_NO_IMAGE_URL = "https://img.yuyu-tei.jp/card_image/noimage_front.jpg"
+
+
+def _shrink_image(data: bytes) -> bytes:
+    """將卡圖縮至 :data:`_THUMBNAIL_SIZE` 內並重新以 JPEG 壓縮。
+
+    未安裝 Pillow、圖檔無法辨識或原圖已夠小時原樣返回。
+    """
+    if Image is None or not data:
+        return data
+    try:
+        with Image.open(io.BytesIO(data)) as im:
+            if im.width <= _THUMBNAIL_SIZE[0] and im.height <= _THUMBNAIL_SIZE[1]:
+                return data
+            im = im.convert("RGB")
+            im.thumbnail(_THUMBNAIL_SIZE)
+            buf = io.BytesIO()
+            # 仍存成 JPEG：圖檔以 .jpg 命名，GUI 依副檔名載入
+            im.save(buf, "JPEG", quality=85, optimize=True)
+    except (OSError, Image.DecompressionBombError):
+        return data
+    return buf.getvalue()
+
+
+# 瀏覽器載入頁面時直接中止的資源類型
+_BLOCKED_RESOURCES = frozenset({"image", "stylesheet", "font", "media"})
+
+
+def _block_heavy_resources(route) -> None:
+    """Playwright 路由：解析用不到的資源一律中止。"""
+    if route.request.resource_type in _BLOCKED_RESOURCES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+# 解析用正規表示式，於模組載入時編譯一次
+_ONCLICK_RE = re.compile(r"location\.href=['\"]([^'\"]+)['\"]")
+_NONDIGIT_RE = re.compile(r"[^0-9]")
+_QTY_RE = re.compile(r"在庫\s*:\s*(\S+)\s*点")
+
+# 單卡頁面擷取欄位：(圖片網址, 特徴, 色, 型番, 價格文字, 在庫文字)
+_CardFields = tuple[str, str, str, str, str, str]
+
+
+def _card_fields_soup(html: str) -> _CardFields:
+    """以 BeautifulSoup 擷取單卡頁面的原始文字欄位。"""
+    soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_CARD_STRAINER)
+    img_url = feature = color = number = price_text = label_text = ""
+    container = soup.find("section", class_="product-detail", id="product-detail")
+    if not container:
+        return img_url, feature, color, number, price_text, label_text
+
+    img_col = container.find(class_="col-lg-5")
+    if img_col:
+        img_elem = img_col.find("img", class_="vimg", src=True)
+        if img_elem:
+            img_url = img_elem["src"]
+
+    info_col = container.find(class_="col-lg-7")
+    if info_col:
+        table_div = info_col.find(class_="table-responsive")
+        if table_div:
+            first_tr = table_div.find("tr")
+            if first_tr:
+                td_elems = first_tr.find_all("td", class_="text-dark")
+                if len(td_elems) >= 1:
+                    feature = td_elems[0].get_text(strip=True)
+                if len(td_elems) >= 2:
+                    color = td_elems[1].get_text(strip=True)
+
+        d_flex_list = info_col.find_all(class_="d-flex")
+        if d_flex_list:
+            border_elem = d_flex_list[0].find(class_="border")
+            if border_elem:
+                number = border_elem.get_text(strip=True)
+        if len(d_flex_list) >= 2:
+            second_flex = d_flex_list[1]
+            price_elem = second_flex.find("h4", class_="fw-bold")
+            if price_elem:
+                price_text = price_elem.get_text(strip=True)
+            label_elem = second_flex.find("label", class_="form-check-label")
+            if label_elem:
+                label_text = label_elem.get_text(strip=True)
+    return img_url, feature, color, number, price_text, label_text
+
+
+if lxml_html is not None:
+    # 選擇器於模組載入時編譯一次，與 _card_fields_soup 的 find 逐一對應
+    _XP_CONTAINER = etree.XPath(
+        f"//section[@id='product-detail' and {_has_class('product-detail')}]"
+    )
+    _XP_IMG_COL = etree.XPath(f".//*[{_has_class('col-lg-5')}]")
+    _XP_IMG = etree.XPath(f".//img[{_has_class('vimg')} and @src]/@src")
+    _XP_INFO_COL = etree.XPath(f".//*[{_has_class('col-lg-7')}]")
+    _XP_TABLE_DIV = etree.XPath(f".//*[{_has_class('table-responsive')}]")
+    _XP_TR = etree.XPath(".//tr")
+    _XP_TDS = etree.XPath(f".//td[{_has_class('text-dark')}]")
+    _XP_D_FLEX = etree.XPath(f".//*[{_has_class('d-flex')}]")
+    _XP_BORDER = etree.XPath(f".//*[{_has_class('border')}]")
+    _XP_PRICE = etree.XPath(f".//h4[{_has_class('fw-bold')}]")
+    _XP_LABEL = etree.XPath(f".//label[{_has_class('form-check-label')}]")
+    _XP_TEXT = etree.XPath(".//text()")
+
+
+def _lxml_text(elem) -> str:
+    """與 get_text(strip=True) 相同：各段文字去空白後串接。"""
+    return "".join(t.strip() for t in _XP_TEXT(elem))
+
+
+def _card_fields_lxml(html: str) -> _CardFields:
+    """以 lxml 與預先編譯的 XPath 擷取欄位，結果與 :func:`_card_fields_soup` 相同。"""
+    img_url = feature = color = number = price_text = label_text = ""
+    try:
+        root = lxml_html.fromstring(html)
+    except etree.ParserError:  # 空白頁面
+        return img_url, feature, color, number, price_text, label_text
+    container = _XP_CONTAINER(root)
+    if not container:
+        return img_url, feature, color, number, price_text, label_text
+    container = container[0]
+
+    img_col = _XP_IMG_COL(container)
+    if img_col:
+        src = _XP_IMG(img_col[0])
+        if src:
+            img_url = str(src[0])
+
+    info_col = _XP_INFO_COL(container)
+    if info_col:
+        info_col = info_col[0]
+        table_div = _XP_TABLE_DIV(info_col)
+        if table_div:
+            first_tr = _XP_TR(table_div[0])
+            if first_tr:
+                td_elems = _XP_TDS(first_tr[0])
+                if len(td_elems) >= 1:
+                    feature = _lxml_text(td_elems[0])
+                if len(td_elems) >= 2:
+                    color = _lxml_text(td_elems[1])
+
+        d_flex_list = _XP_D_FLEX(info_col)
+        if d_flex_list:
+            border_elem = _XP_BORDER(d_flex_list[0])
+            if border_elem:
+                number = _lxml_text(border_elem[0])
+        if len(d_flex_list) >= 2:
+            second_flex = d_flex_list[1]
+            price_elem = _XP_PRICE(second_flex)
+            if price_elem:
+                price_text = _lxml_text(price_elem[0])
+            label_elem = _XP_LABEL(second_flex)
+            if label_elem:
+                label_text = _lxml_text(label_elem[0])
+    return img_url, feature, color, number, price_text, label_text
+
+
+def _card_fields_lexbor(html: str) -> _CardFields:
+    """以 selectolax/Lexbor 擷取欄位，結果與 :func:`_card_fields_soup` 相同。"""
+    tree = LexborHTMLParser(html)
+    img_url = feature = color = number = price_text = label_text = ""
+    container = tree.css_first("section#product-detail.product-detail")
+    if container is None:
+        return img_url, feature, color, number, price_text, label_text
+
+    # 複合選擇器一次走訪 (Lexbor 以 C 比對)，省去逐層 css_first 的呼叫；
+    # 頁面只有一個圖片欄與資訊欄，結果與逐層查找相同
+    img_elem = container.css_first(".col-lg-5 img.vimg[src]")
+    if img_elem is not None:
+        img_url = img_elem.attributes.get("src") or ""
+
+    first_tr = container.css_first(".col-lg-7 .table-responsive tr")
+    if first_tr is not None:
+        td_elems = first_tr.css("td.text-dark")
+        if len(td_elems) >= 1:
+            feature = td_elems[0].text(strip=True)
+        if len(td_elems) >= 2:
+            color = td_elems[1].text(strip=True)
+
+    d_flex_list = container.css(".col-lg-7 .d-flex")
+    if d_flex_list:
+        border_elem = d_flex_list[0].css_first(".border")
+        if border_elem is not None:
+            number = border_elem.text(strip=True)
+    if len(d_flex_list) >= 2:
+        second_flex = d_flex_list[1]
+        price_elem = second_flex.css_first("h4.fw-bold")
+        if price_elem is not None:
+            price_text = price_elem.text(strip=True)
+        label_elem = second_flex.css_first("label.form-check-label")
+        if label_elem is not None:
+            label_text = label_elem.text(strip=True)
+    return img_url, feature, color, number, price_text, label_text
+
+
+if LexborHTMLParser is not None:
+    _card_fields = _card_fields_lexbor
+elif lxml_html is not None:
+    _card_fields = _card_fields_lxml
+else:
+    _card_fields = _card_fields_soup
+
+
+# 產品頁的單卡連結：(網址, 卡名, 稀有度)
+_CardEntry = tuple[str, str, str]
+# 不收錄的稀有度 (common/uncommon)
+_SKIP_RARITIES = frozenset({"C", "U", "UC"})
+
+
+def _card_entries_soup(html: str) -> List[_CardEntry]:
+    """以 BeautifulSoup 列出產品頁的單卡連結，依頁面順序。"""
+    soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_PRODUCT_STRAINER)
+    entries: List[_CardEntry] = []
+
+    # ▸ 主要卡片列表區塊
+    container = soup.find(class_="col-12 mb-5 pb-5")
+    if not container:
+        return entries
+
+    for card_list in container.find_all("div", id="card-list3", class_="py-4"):
+        rarity_elem = card_list.find(class_="py-2")
+        rarity = rarity_elem.get_text(strip=True) if rarity_elem else ""
+        if rarity.strip().upper() in _SKIP_RARITIES:
+            continue
+        for row in card_list.select("div.row"):
+            for col in row.select("div.col-md"):
+                link = col.find("a", href=True)
+                if not link:
+                    continue
+                name_tag = col.find(class_="text-primary")
+                card_name = name_tag.get_text(strip=True) if name_tag else ""
+                entries.append((link["href"], card_name, rarity))
+    return entries
+
+
+def _card_entries_lexbor(html: str) -> List[_CardEntry]:
+    """以 selectolax/Lexbor 列出單卡連結，結果與 :func:`_card_entries_soup` 相同。"""
+    tree = LexborHTMLParser(html)
+    entries: List[_CardEntry] = []
+    container = tree.css_first('[class="col-12 mb-5 pb-5"]')
+    if container is None:
+        return entries
+
+    for card_list in container.css("div#card-list3.py-4"):
+        rarity_elem = card_list.css_first(".py-2")
+        rarity = rarity_elem.text(strip=True) if rarity_elem is not None else ""
+        if rarity.strip().upper() in _SKIP_RARITIES:
+            continue
+        for row in card_list.css("div.row"):
+            for col in row.css("div.col-md"):
+                link = col.css_first("a[href]")
+                if link is None:
+                    continue
+                name_tag = col.css_first(".text-primary")
+                card_name = name_tag.text(strip=True) if name_tag is not None else ""
+                entries.append((link.attributes.get("href") or "", card_name, rarity))
+    return entries
+
+
+_card_entries = _card_entries_lexbor if LexborHTMLParser is not None else _card_entries_soup
+
+
+def _parse_card_html(html: str) -> tuple[Card, str]:
+    """解析卡片欄位，回傳 (不含圖片的 Card, 待下載的圖片網址或空字串)。
+
+    純函式，可交給 :class:`ProcessPoolExecutor` 在子行程執行。
+    """
+    img_url, feature, color, number, price_text, label_text = _card_fields(html)
+    if not img_url.endswith(".jpg") or img_url == _NO_IMAGE_URL:
+        img_url = ""
+
+    price = 0
+    if price_text:
+        try:
+            price = int(_NONDIGIT_RE.sub("", price_text))
+        except ValueError:
+            price = 0
+
+    quantity = 0
+    m = _QTY_RE.search(label_text)
+    if m:
+        qty_str = m.group(1)
+        try:
+            quantity = int(qty_str)
+        except ValueError:
+            quantity = 0
+
+    card = Card(
+        name="",
+        rarity="",
+        url="",
+        image=b"",
+        number=number,
+        price=price,
+        quantity=quantity,
+        scraped_at=date.today(),
+        feature=feature,
+        color=color,
+    )
+    return card, img_url
+
+
+class _HostRateLimiter:
+    """依主機分配請求起始時間，使同一主機的請求平均分散而非成批送出。
+
+    執行緒與事件迴圈皆可呼叫：``reserve`` 只在鎖內計算，等待由呼叫端進行。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._next: Dict[str, float] = {}
+
+    def reserve(self, url: str, interval: float) -> float:
+        """為 ``url`` 的主機預約下一個空檔，回傳需等待的秒數。"""
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + interval
+        return start - now
+
 
 class Scraper:
     """負責下載 HTML 與解析指定元素。"""
 
     def __init__(
-        self, url: str, timeout: int = 10, max_workers: int = 5, use_selenium: bool = True
+        self,
+        url: str,
+        timeout: int = 10,
+        max_workers: int = 5,
+        use_selenium: bool = True,
+        http_cache: str | None = None,
     ) -> None:
         self.url = url
         self.timeout = timeout
         self.max_workers = max_workers
         self.use_selenium = use_selenium
+        # HTTP 快取檔名前綴（例如 ``<db>.scrape_cache``）；預設 None 停用，避免在工作目錄留下檔案
+        self.http_cache = http_cache
         # 改用 Session 可重複利用 TCP 連線並設定通用 headers
-        self.session: requests.Session = requests.Session()
+        if requests_cache is not None and http_cache:
+            # 每次都以 ETag/Last-Modified 重新驗證：價格不會過期，未變更的頁面只回 304
+            self.session: requests.Session = requests_cache.CachedSession(
+                http_cache,
+                backend="sqlite",
+                expire_after=requests_cache.EXPIRE_IMMEDIATELY,
+                cache_control=True,
+                always_revalidate=True,
+            )
+        else:
+            self.session = requests.Session()
         self.session.headers.update(
             {
                 "User-Agent": (
@@ -57,13 +516,32 @@ class Scraper:
             status_forcelist=(429, 500, 502, 503, 504),
             allowed_methods=("GET",),
         )
-        adapter = HTTPAdapter(max_retries=retry)
+        # 每個主機保留的連線數等於同時執行的工作執行緒數；
+        # max_workers 超過 urllib3 預設的 10 時，多出的連線才不會用完即丟、重新交握
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=self.max_workers)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-        # 控制請求頻率以避免 QUOTA exceeded
+        # 控制請求頻率以避免 QUOTA exceeded：
+        # 每個主機每 request_interval 秒最多 max_workers 個請求，且平均分散
         self.request_interval = 1.0
+        self._rate_limiter = _HostRateLimiter()
         self.driver = None
-        if self.use_selenium and webdriver is not None:
+        self.page = None
+        self._playwright = None
+        self._parse_pool: ProcessPoolExecutor | None = None
+        # 已入庫的 (產品名稱, 卡名)；卡圖只在建立卡片時寫入，這些不需下載
+        self.known_cards: Set[Tuple[str, str]] = set()
+        # 單次 parse() 內已解析的卡片 (網址 -> (Card, 圖片網址))，跨產品共用
+        self._card_cache: Dict[str, Tuple[Card, str]] = {}
+        # 本次 parse() 的抓取日期，所有卡片共用同一天
+        self._scraped_at: date | None = None
+        # 非同步下載用的事件迴圈執行緒與 httpx client，首次使用時建立
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._async_client = None
+        if self.use_selenium and sync_playwright is not None:
+            self._start_playwright()
+        if self.use_selenium and self.page is None and webdriver is not None:
             chrome_options = Options()
             chrome_options.add_argument("--headless")
             chrome_options.add_argument("--no-sandbox")
@@ -88,225 +566,330 @@ class Scraper:
     # ------------------------------------------------------------------
     def fetch(self) -> str:
         """下載目標頁面 HTML。"""
-        if self.use_selenium and self.driver is not None:
-            try:
-                self.driver.get(self.url)
-            except TimeoutException:
-                pass
-            return self.driver.page_source
-        time.sleep(self.request_interval)
-        resp = self.session.get(self.url, timeout=self.timeout)
-        resp.raise_for_status()  # 若非 2xx 會拋出 HTTPError
-        return resp.text
+        return self.fetch_page(self.url)
 
     def fetch_page(self, url: str) -> str:
         """下載指定產品頁面 HTML。"""
+        if self.use_selenium and self.page is not None:
+            try:
+                # 圖片/CSS 已封鎖，load 事件幾乎緊接著 DOMContentLoaded
+                self.page.goto(url, wait_until="load")
+            except PlaywrightTimeoutError:
+                pass
+            return self.page.content()
         if self.use_selenium and self.driver is not None:
             try:
                 self.driver.get(url)
             except TimeoutException:
                 pass
             return self.driver.page_source
-        time.sleep(self.request_interval)
+        return self._http_get(url)
+
+    def _throttle(self, url: str) -> float:
+        """回傳對 ``url`` 送出請求前須等待的秒數。"""
+        return self._rate_limiter.reserve(url, self.request_interval / self.max_workers)
+
+    def _http_get(self, url: str, binary: bool = False) -> str | bytes:
+        """以 requests Session 下載頁面，可於多執行緒下呼叫。"""
+        time.sleep(self._throttle(url))
         resp = self.session.get(url, timeout=self.timeout)
-        resp.raise_for_status()
-        return resp.text
+        resp.raise_for_status()  # 若非 2xx 會拋出 HTTPError
+        return resp.content if binary else resp.text
+
+    def _start_playwright(self) -> None:
+        """啟動 Playwright Chromium；失敗時保持 ``self.page`` 為 None。"""
+        try:
+            self._playwright = sync_playwright().start()
+            browser = self._playwright.chromium.launch(
+                headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"]
+            )
+            context = browser.new_context(user_agent=self.session.headers["User-Agent"])
+            context.set_default_navigation_timeout(self.timeout * 1000)
+            context.route("**/*", _block_heavy_resources)
+            self.page = context.new_page()
+        except Exception:
+            self._stop_playwright()
+
+    def _stop_playwright(self) -> None:
+        if self.page is not None:
+            try:
+                self.page.context.browser.close()
+            except Exception:
+                pass
+            self.page = None
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """回傳共用的 httpx.AsyncClient，首次呼叫時建立；須在 :attr:`_loop` 上呼叫。
+
+        整次執行共用同一個連線池，HTTP/2 下每個主機只需一次 TLS 交握。
+        """
+        if self._async_client is None:
+            limits = httpx.Limits(max_connections=self.max_workers)
+            transport = httpx.AsyncHTTPTransport(http2=_HTTP2, limits=limits)
+            headers = {"User-Agent": self.session.headers["User-Agent"]}
+            if hishel is not None and self.http_cache:
+                # 放在專屬資料夾：hishel 會在資料庫所在目錄寫入 .gitignore
+                cache_file = Path(f"{self.http_cache}.httpx") / "cache.sqlite"
+                storage = hishel.AsyncSqliteStorage(database_path=cache_file)
+                transport = AsyncCacheTransport(next_transport=transport, storage=storage)
+                # no-cache 要求快取先向伺服器驗證，與 requests 端相同
+                headers["Cache-Control"] = "no-cache"
+            self._async_client = httpx.AsyncClient(
+                transport=transport,
+                headers=headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+        return self._async_client
+
+    def _run_async(self, coro):
+        """在專屬事件迴圈執行緒上執行 ``coro`` 並等待結果。
+
+        迴圈跨呼叫保留，連線才能重複使用；也避開 Playwright 佔用的主執行緒 loop。
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _stop_async(self) -> None:
+        if self._loop is None:
+            return
+        if self._async_client is not None:
+            self._run_async(self._async_client.aclose())
+            self._async_client = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._loop = None
+        self._loop_thread = None
+
+    async def fetch_many(
+        self, urls: List[str], binary: bool = False
+    ) -> List[str | bytes | None]:
+        """以 httpx 非同步並行下載多個網址，失敗者回傳 None。
+
+        ``binary`` 為 True 時回傳原始位元組 (圖片)，否則回傳解碼後的 HTML。
+        須透過 :meth:`_run_async` 在共用事件迴圈上執行。
+        """
+        client = self._get_async_client()
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def fetch(url: str) -> str | bytes | None:
+            async with semaphore:
+                for attempt in range(_RETRY_TOTAL + 1):
+                    # 與同步版共用同一個節流器，避免 QUOTA exceeded
+                    await asyncio.sleep(self._throttle(url))
+                    try:
+                        resp = await client.get(url)
+                    except httpx.HTTPError:
+                        if attempt == _RETRY_TOTAL:
+                            return None
+                    else:
+                        if resp.status_code not in _RETRY_STATUS or attempt == _RETRY_TOTAL:
+                            if not resp.is_success:
+                                return None
+                            return resp.content if binary else resp.text
+                    await asyncio.sleep(2 ** attempt)
+            return None
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
 
     def parse_card_page(self, html: str) -> Card:
         """解析單一卡片頁面以取得詳細資訊 (不含卡片名稱)。"""
-        soup = BeautifulSoup(html, "html.parser")
-
-        img_bytes = b""
-        number = ""
-        price = 0
-        quantity = 0
-        feature = ""
-        color = ""
-        container = soup.find(
-            "section", class_="product-detail", id="product-detail"
-        )
-        if container:
-            img_col = container.find(class_="col-lg-5")
-            if img_col:
-                img_elem = img_col.find("img", class_="vimg", src=True)
-                if img_elem:
-                    img_url = img_elem["src"]
-                    if (
-                        img_url.endswith(".jpg")
-                        and img_url
-                        != "https://img.yuyu-tei.jp/card_image/noimage_front.jpg"
-                    ):
-                        try:
-                            resp = self.session.get(img_url, timeout=self.timeout)
-                            resp.raise_for_status()
-                            img_bytes = resp.content
-                        except requests.RequestException:
-                            img_bytes = b""
-
-            info_col = container.find(class_="col-lg-7")
-            if info_col:
-                table_div = info_col.find(class_="table-responsive")
-                if table_div:
-                    first_tr = table_div.find("tr")
-                    if first_tr:
-                        td_elems = first_tr.find_all("td", class_="text-dark")
-                        if len(td_elems) >= 1:
-                            feature = td_elems[0].get_text(strip=True)
-                        if len(td_elems) >= 2:
-                            color = td_elems[1].get_text(strip=True)
-
-                d_flex_list = info_col.find_all(class_="d-flex")
-                if d_flex_list:
-                    border_elem = d_flex_list[0].find(class_="border")
-                    if border_elem:
-                        number = border_elem.get_text(strip=True)
-                if len(d_flex_list) >= 2:
-                    second_flex = d_flex_list[1]
-                    price_elem = second_flex.find("h4", class_="fw-bold")
-                    if price_elem:
-                        price_text = price_elem.get_text(strip=True)
-                        try:
-                            price = int(re.sub(r"[^0-9]", "", price_text))
-                        except ValueError:
-                            price = 0
-
-                    label_elem = second_flex.find("label", class_="form-check-label")
-                    if label_elem:
-                        label_text = label_elem.get_text(strip=True)
-                        m = re.search(r"在庫\s*:\s*(\S+)\s*点", label_text)
-                        if m:
-                            qty_str = m.group(1)
-                            try:
-                                quantity = int(qty_str)
-                            except ValueError:
-                                quantity = 0
-
-
-        return Card(
-            name="",
-            rarity="",
-            url="",
-            image=img_bytes,
-            number=number,
-            price=price,
-            quantity=quantity,
-            scraped_at=date.today(),
-            feature=feature,
-            color=color,
-        )
+        card, img_url = _parse_card_html(html)
+        # 沒有型番的頁面會被丟棄，不必下載卡圖
+        if img_url and card.number:
+            try:
+                card.image = _shrink_image(self._http_get(img_url, binary=True))
+            except requests.RequestException:
+                card.image = b""
+        return card
+
+    def _fetch_all(
+        self, urls: List[str], executor: ThreadPoolExecutor, binary: bool = False
+    ) -> List[str | bytes | None]:
+        """並行下載 ``urls``；有 httpx 用非同步連線池，否則用執行緒。"""
+        if httpx is not None:
+            return self._run_async(self.fetch_many(urls, binary))
+
+        def get(url: str) -> str | bytes | None:
+            # 瀏覽器不可跨執行緒共用，一律走 requests
+            try:
+                return self._http_get(url, binary)
+            except requests.RequestException:
+                return None
 
-    def parse_product_page(self, html: str) -> List[Card]:
-        """解析產品頁面以取得卡片清單，依稀有度排序。"""
-        soup = BeautifulSoup(html, "html.parser")
+        return list(executor.map(get, urls))
 
-        # ▸ 主要卡片列表區塊
-        container = soup.find(class_="col-12 mb-5 pb-5")
-        if not container:
-            return []
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """解析單卡頁面用的行程池，首次使用時建立並跨產品重複使用。"""
+        if self._parse_pool is None:
+            # 此時已有事件迴圈、下載與寫入執行緒；fork 多執行緒行程可能讓子行程死鎖
+            method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=mp.get_context(method)
+            )
+        return self._parse_pool
 
-        cards: List[Card] = []
-        card_lists = container.find_all("div", id="card-list3", class_="py-4")
-        if not card_lists:
-            return cards
+    def parse_product_page(self, html: str, product: str = "") -> List[Card]:
+        """解析產品頁面以取得卡片清單，依稀有度排序。
 
+        ``product`` 為產品名稱，用來判斷哪些卡片已入庫、不必再下載卡圖。
+        """
+        cards: List[Card] = []
         # Precollect all card links so we know the total for progress output
-        entries: List[tuple[str, str, str]] = []
-        for card_list in card_lists:
-            rarity_elem = card_list.find(class_="py-2")
-            rarity = rarity_elem.get_text(strip=True) if rarity_elem else ""
-            # Skip common/uncommon cards
-            if rarity.strip().upper() in {"C", "U", "UC"}:
-                continue
-            for row in card_list.select("div.row"):
-                for col in row.select("div.col-md"):
-                    link = col.find("a", href=True)
-                    if not link:
-                        continue
-                    card_url = link["href"]
-                    name_tag = col.find(class_="text-primary")
-                    card_name = name_tag.get_text(strip=True) if name_tag else ""
-                    entries.append((card_url, card_name, rarity))
+        # 以網址為鍵去重：同一張卡可能出現在多個區塊，只取第一次出現者
+        entries: dict[str, _CardEntry] = {}
+        for entry in _card_entries(html):
+            entries.setdefault(entry[0], entry)
+        if not entries:
+            return cards
 
         total = len(entries)
+        scraped_at = self._scraped_at or date.today()
+        # 其他產品已抓過的卡片直接沿用，不重新下載頁面
+        todo = [e for url, e in entries.items() if url not in self._card_cache]
 
-        def worker(entry: tuple[str, str, str]) -> Card | None:
-            card_url, card_name, rarity = entry
-            try:
-                card_html = self.fetch_page(card_url)
-                card = self.parse_card_page(card_html)
-                if not card.number:
-                    return None
-                card.rarity = rarity
-                card.url = card_url
-                card.name = card_name
-                return card
-            except requests.RequestException:
-                return None
-
+        # 下載 (執行緒/非同步) 與解析 (行程池) 分開，解析不再受 GIL 限制
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(worker, e) for e in entries]
-            for idx, f in enumerate(as_completed(futures), 1):
-                card = f.result()
-                if card:
-                    cards.append(card)
-                print(
-                    f"[parse_product_page] {idx}/{total} {card.name if card else ''}",
-                    flush=True,
-                )
+            pages = self._fetch_all([e[0] for e in todo], executor)
+            fetched = [(e, page) for e, page in zip(todo, pages) if page is not None]
+            parsed = self._get_parse_pool().map(
+                _parse_card_html, [page for _, page in fetched], chunksize=16
+            )
+            fresh: Set[str] = set()
+            for (entry, _), (card, img_url) in zip(fetched, parsed):
+                if card.number:
+                    card.url, card.name, card.rarity = entry
+                    card.scraped_at = scraped_at
+                    self._card_cache[card.url] = (card, img_url)
+                    fresh.add(card.url)
+
+            # (Card, 圖片網址)；卡圖依 (產品, 卡名) 存檔，只有尚未入庫者需要
+            found: List[tuple[Card, str]] = []
+            for card_url, card_name, rarity in entries.values():
+                cached = self._card_cache.get(card_url)
+                if cached is None:
+                    continue
+                card, img_url = cached
+                # 沿用其他產品的卡片時複製一份，已產出的物件不再被修改
+                if card_url not in fresh:
+                    card = replace(card, name=card_name, rarity=rarity)
+                if card.image or (product, card_name) in self.known_cards:
+                    img_url = ""
+                found.append((card, img_url))
+
+            img_urls = list(dict.fromkeys(img_url for _, img_url in found if img_url))
+            images = self._fetch_all(img_urls, executor, binary=True)
+            thumbs = dict(
+                zip(img_urls, executor.map(_shrink_image, [img or b"" for img in images]))
+            )
+            for idx, (card, img_url) in enumerate(found, 1):
+                if img_url:
+                    card.image = thumbs[img_url]
+                    # 之後沿用這張卡的產品也帶著卡圖，不必再下載
+                    cached_card = self._card_cache[card.url][0]
+                    if not cached_card.image:
+                        self._card_cache[card.url] = (
+                            replace(cached_card, image=card.image),
+                            img_url,
+                        )
+                cards.append(card)
+                print(f"[parse_product_page] {idx}/{total} {card.name}", flush=True)
 
         return cards
 
     def parse(self, html: str) -> List[Product]:
         """解析 HTML 取得 button 文字與網址並組成 ``Product`` 物件。"""
-        soup = BeautifulSoup(html, "html.parser")
+        return list(self.iter_parse(html))
 
-        # ▸ 僅抓取 <div class="tab-content"> 內的 <div class="accordion accordion-flush"> 區塊
-        accordion_divs: List[Tag] = soup.select(
-            "div.tab-content div.accordion.accordion-flush"
-        )
-        results: List[Product] = []
-
-        # Precollect product buttons so progress can be shown
-        buttons: List[Tag] = []
-        for div in accordion_divs:
-            for btn in div.select(
-                "div#side-sell-single h2.accordion-header > button[onclick]"
-            ):
-                if btn.find_parent(id="side-sell-target-11"):
-                    continue
-                buttons.append(btn)
+    def iter_parse(self, html: str) -> Iterator[Product]:
+        """同 :meth:`parse`，但每完成一個產品就產出，呼叫端可邊解析邊寫入。"""
+        buttons = _index_buttons(html)
 
-        total = len(buttons)
-        for idx, btn in enumerate(buttons, 1):
-            onclick_attr = btn.get("onclick", "")
-            m = re.search(r"location\.href=['\"]([^'\"]+)['\"]", onclick_attr)
-            if not m:
-                continue
+        # (進度序號, Product)；序號沿用按鈕順序
+        pending: List[tuple[int, Product]] = []
+        for idx, (name, onclick_attr) in enumerate(buttons, 1):
+            m = _ONCLICK_RE.search(onclick_attr)
+            if m:
+                pending.append((idx, Product(name=name, url=m.group(1))))
 
-            print(f"[parse] {idx}/{total} {btn.get_text(strip=True)}", flush=True)
-            product = Product(
-                name=btn.get_text(strip=True),
-                url=m.group(1),
-            )
-            try:
-                product_html = self.fetch_page(product.url)
-                product.cards = self.parse_product_page(product_html)
-            except requests.RequestException:
-                product.cards = []
-            results.append(product)
-        return results
+        # 沒有瀏覽器時產品頁也只是 HTTP 請求，先一次並行下載完
+        pages: List[str | None] = []
+        if not (self.use_selenium and (self.page is not None or self.driver is not None)):
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages = self._fetch_all([p.url for _, p in pending], executor)
 
-    def __del__(self) -> None:  # pragma: no cover - cleanup
+        total = len(buttons)
+        # 卡片快取只在本次執行有效：價格每天都要重新抓取
+        self._card_cache.clear()
+        # 跨過午夜的執行也記在開始當天，同一次抓取的價格日期一致
+        self._scraped_at = date.today()
+        try:
+            for i, (idx, product) in enumerate(pending):
+                print(f"[parse] {idx}/{total} {product.name}", flush=True)
+                try:
+                    product_html = pages[i] if pages else self.fetch_page(product.url)
+                    if product_html is not None:
+                        product.cards = self.parse_product_page(product_html, product.name)
+                except requests.RequestException:
+                    product.cards = []
+                yield product
+        finally:
+            self._card_cache.clear()
+            self._scraped_at = None
+
+    def close(self) -> None:
+        """關閉瀏覽器與 HTTP 連線；可重複呼叫。"""
+        self._stop_playwright()
+        self._stop_async()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
         if self.driver is not None:
             try:
                 self.driver.quit()
             except Exception:
                 pass
+            self.driver = None
+        self.session.close()
+
+    def __del__(self) -> None:  # pragma: no cover - cleanup
+        self.close()
 
 
 if __name__ == "__main__":  # Quick manual test
-    import json
+    import hashlib
+    import sys
+    from dataclasses import asdict
+
+    def _default(obj):
+        # 卡圖只輸出 SHA-1 以便比對，不傾印二進位內容；日期轉 ISO 字串
+        if isinstance(obj, bytes):
+            return hashlib.sha1(obj).hexdigest() if obj else ""
+        if isinstance(obj, date):
+            return obj.isoformat()
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
 
     scraper = Scraper("https://yuyu-tei.jp/top/opc", use_selenium=True)
     data = scraper.run()
-    print(json.dumps([p.__dict__ for p in data], ensure_ascii=False, indent=2))
+    # orjson (Rust 實作) 直接序列化 dataclass，未安裝時退回標準 json
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - optional dependency
+        import json
+
+        out = json.dumps(
+            [asdict(p) for p in data], ensure_ascii=False, indent=2, default=_default
+        ).encode("utf-8")
+    else:
+        out = orjson.dumps(data, default=_default, option=orjson.OPT_INDENT_2)
+    sys.stdout.buffer.write(out + b"\n")
@@ -0,0 +1,167 @@
+import sqlite3
+from datetime import date
+
+from db_manager import DatabaseManager
+from models import Card, Product
+
+
+def _card(name, rarity="SR", number="OP01-001", price=100, image=b"", url=None):
+    return Card(
+        name=name,
+        rarity=rarity,
+        url=url or f"https://x/{name}",
+        image=image,
+        number=number,
+        price=price,
+        quantity=1,
+        scraped_at=date(2026, 1, 1),
+    )
+
+
+def _baseline_db(path, prices, card_columns="feature VARCHAR(50), color VARCHAR(50), "):
+    """Create a database with the schema of the first release, dates as text."""
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        f"""
+        CREATE TABLE product (
+            id INTEGER NOT NULL, name VARCHAR(255) NOT NULL, url VARCHAR(1024) NOT NULL,
+            PRIMARY KEY (id), UNIQUE (name));
+        CREATE TABLE rarity (
+            id INTEGER NOT NULL, name VARCHAR(50) NOT NULL, PRIMARY KEY (id), UNIQUE (name));
+        CREATE TABLE card (
+            id INTEGER NOT NULL, product_id INTEGER NOT NULL, name VARCHAR(255) NOT NULL,
+            rarity_id INTEGER NOT NULL, url VARCHAR(1024) NOT NULL, number VARCHAR(50) NOT NULL,
+            {card_columns}PRIMARY KEY (id),
+            CONSTRAINT uix_product_card_name UNIQUE (product_id, name),
+            FOREIGN KEY(product_id) REFERENCES product (id),
+            FOREIGN KEY(rarity_id) REFERENCES rarity (id));
+        CREATE TABLE card_price (
+            id INTEGER NOT NULL, card_id INTEGER NOT NULL, price INTEGER NOT NULL,
+            quantity INTEGER NOT NULL, scraped_at DATE NOT NULL, PRIMARY KEY (id),
+            CONSTRAINT uix_card_price_date UNIQUE (card_id, scraped_at),
+            FOREIGN KEY(card_id) REFERENCES card (id));
+        INSERT INTO product VALUES (1, 'Old', 'p0');
+        INSERT INTO rarity VALUES (1, 'SR');
+        INSERT INTO card (id, product_id, name, rarity_id, url, number)
+            VALUES (1, 1, 'OldCard', 1, 'https://x/old', 'OP01-009');
+        """
+    )
+    conn.executemany(
+        "INSERT INTO card_price (card_id, price, quantity, scraped_at) VALUES (1, ?, 1, ?)",
+        [(price, day.isoformat()) for day, price in prices],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_known_cards_are_product_and_card_names(tmp_path):
+    with DatabaseManager(str(tmp_path / "t.db")) as db:
+        db.insert_products(
+            [Product(name="OldProd", url="p1", cards=[_card("Card2", url="https://x/card/2")])]
+        )
+        assert db.known_cards() == {("OldProd", "Card2")}
+
+        reprint = _card("Card2", url="https://x/card/2", image=b"JPEG")
+        db.insert_products([Product(name="NewProd", url="p2", cards=[reprint])])
+        assert (tmp_path / "picture" / "NewProd" / "Card2.jpg").read_bytes() == b"JPEG"
+
+
+def test_plot_data_labels_come_from_one_row(tmp_path):
+    with DatabaseManager(str(tmp_path / "t.db")) as db:
+        db.insert_products(
+            [
+                Product(name="P1", url="p1", cards=[_card("Dup", "SR", "OP01-001", 100)]),
+                Product(name="P2", url="p2", cards=[_card("Dup", "L", "OP02-001", 300)]),
+            ]
+        )
+        df = db.fetch_plot_data()
+        assert len(df) == 1
+        row = df.iloc[0]
+        assert (row["product"], row["rarity"], row["number"]) == ("P1", "SR", "OP01-001")
+        assert row["price"] == 200
+
+        only_p2 = db.fetch_plot_data(products=["P2"]).iloc[0]
+        assert (only_p2["product"], only_p2["rarity"], only_p2["number"]) == ("P2", "L", "OP02-001")
+
+
+def test_narrow_fetch_caches_every_column(tmp_path, monkeypatch):
+    import pandas as pd
+
+    db_path = str(tmp_path / "t.db")
+    with DatabaseManager(db_path) as db:
+        db.insert_products([Product(name="P1", url="p1", cards=[_card("A")])])
+        narrow = db.fetch_dataframe(columns=["price", "scraped_at"])
+        assert list(narrow.columns) == ["price", "scraped_at"]
+
+        def no_sql(*args, **kwargs):
+            raise AssertionError("full fetch should be served from the parquet cache")
+
+        monkeypatch.setattr(pd, "read_sql_query", no_sql)
+        # A second manager has no in-memory frame and must use the parquet file
+        with DatabaseManager(db_path) as other:
+            df = other.fetch_dataframe()
+    assert list(df.columns) == [
+        "product", "card", "number", "rarity", "feature", "color", "price", "quantity", "scraped_at"
+    ]
+    assert df.iloc[0]["card"] == "A"
+
+
+def test_upgrade_converts_text_dates_to_ordinals(tmp_path):
+    db_path = tmp_path / "old.db"
+    days = [date(2025, 12, 31), date(2026, 1, 1)]
+    _baseline_db(db_path, [(days[0], 100), (days[1], 200)])
+
+    with DatabaseManager(str(db_path)) as db:
+        df = db.fetch_dataframe()
+    # Opening again must not convert the ordinals a second time
+    DatabaseManager(str(db_path)).close()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    rows = conn.execute(
+        "SELECT scraped_at, typeof(scraped_at) FROM card_price ORDER BY id"
+    ).fetchall()
+    conn.close()
+    assert rows == [(day.toordinal(), "integer") for day in days]
+    assert df["scraped_at"].dt.date.tolist() == days
+    assert df["price"].tolist() == [100, 200]
+
+
+def test_upgrade_adds_card_columns_and_indexes(tmp_path):
+    db_path = tmp_path / "old.db"
+    # Databases from before feature/color were scraped lack both columns
+    _baseline_db(db_path, [(date(2025, 12, 31), 100)], card_columns="")
+
+    with DatabaseManager(str(db_path)) as db:
+        new = _card("NewCard", number="OP01-010", price=300)
+        new.feature, new.color = "海賊", "赤"
+        db.insert_products([Product(name="New", url="p1", cards=[new])])
+
+        assert db.fetch_dataframe(features=["海賊"])["card"].tolist() == ["NewCard"]
+        assert db.fetch_dataframe(colors=["赤"], min_price=200)["price"].tolist() == [300]
+        old = db.fetch_dataframe(products=["Old"]).iloc[0]
+        assert (old["card"], old["feature"], old["color"]) == ("OldCard", "", "")
+
+    conn = sqlite3.connect(db_path)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(card)")}
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    assert {"feature", "color"} <= columns
+    assert {"ix_card_product_rarity", "ix_cp_card_date_price", "ix_cp_date_price"} <= indexes
+
+
+def test_price_ranges_and_card_products(tmp_path):
+    with DatabaseManager(str(tmp_path / "t.db")) as db:
+        assert db.price_ranges() is None
+        assert db.card_products() == {}
+
+        late = _card("Dup", price=300)
+        late.scraped_at = date(2026, 2, 1)
+        db.insert_products(
+            [
+                Product(name="P1", url="p1", cards=[_card("Dup", price=100), _card("B", price=50)]),
+                Product(name="P2", url="p2", cards=[late]),
+            ]
+        )
+        assert db.price_ranges() == (50, 300, date(2026, 1, 1), date(2026, 2, 1))
+        assert db.card_products() == {"Dup": "P1", "B": "P1"}
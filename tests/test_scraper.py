@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import db_manager
+import main
+import scraper
+
+PRODUCT_HTML = """<html><body><div class="col-12 mb-5 pb-5">
+<div id="card-list3" class="py-4"><h3 class="py-2">SR</h3><div class="row">
+<div class="col-md"><a href="https://x/card/2">img</a><h4 class="text-primary">Card2</h4></div>
+</div></div></div></body></html>"""
+
+CARD_HTML = """<html><body><section class="product-detail" id="product-detail">
+<div class="col-lg-5"><img class="vimg" src="https://x/img/2.jpg"></div>
+<div class="col-lg-7"><div class="table-responsive"><table><tr>
+<td class="text-dark">特徴</td><td class="text-dark">赤</td></tr></table></div>
+<div class="d-flex"><span class="border">OP01-002</span></div>
+<div class="d-flex"><h4 class="fw-bold">1,200 円</h4>
+<label class="form-check-label">在庫 : 3 点</label></div>
+</div></section></body></html>"""
+
+PRODUCT_COUNT = 6
+
+INDEX_HTML = """<html><body><div class="tab-content"><div class="accordion accordion-flush">
+<div id="side-sell-single">%s</div></div></div></body></html>""" % "".join(
+    f'<h2 class="accordion-header"><button onclick="location.href=\'https://x/p/{i}\'">'
+    f"OP-0{i}</button></h2>"
+    for i in range(1, PRODUCT_COUNT + 1)
+)
+
+RESPONSES = {
+    "https://x/card/2": CARD_HTML,
+    "https://x/img/2.jpg": b"JPEG-BYTES",
+    **{f"https://x/p/{i}": PRODUCT_HTML for i in range(1, PRODUCT_COUNT + 1)},
+}
+
+
+def _offline_scraper(url="https://x/top"):
+    """Scraper whose HTTP fetches are answered from RESPONSES."""
+    sc = scraper.Scraper(url, use_selenium=False, http_cache=None)
+    sc.requested = []
+
+    def fetch_all(urls, executor, binary=False):
+        sc.requested.extend(urls)
+        return [RESPONSES.get(url) for url in urls]
+
+    sc._fetch_all = fetch_all
+    return sc
+
+
+@pytest.mark.parametrize("html", ["", "   "])
+def test_index_buttons_blank_page(html):
+    assert scraper._index_buttons(html) == []
+    assert scraper._index_buttons_soup(html) == []
+
+
+@pytest.fixture
+def scr(monkeypatch):
+    sc = _offline_scraper()
+    monkeypatch.setattr(sc, "_get_parse_pool", lambda: ThreadPoolExecutor(1))
+    yield sc
+    sc.close()
+
+
+def test_known_card_skips_image(scr):
+    scr.known_cards = {("OldProd", "Card2")}
+    (card,) = scr.parse_product_page(PRODUCT_HTML, "OldProd")
+    assert card.number == "OP01-002"
+    assert card.image == b""
+    assert "https://x/img/2.jpg" not in scr.requested
+
+
+def test_same_url_in_new_product_fetches_image(scr):
+    # The picture is stored per product, so a reprint under a new product
+    # needs its own image even though the card URL is already known.
+    scr.known_cards = {("OldProd", "Card2")}
+    scr.parse_product_page(PRODUCT_HTML, "OldProd")
+    (card,) = scr.parse_product_page(PRODUCT_HTML, "NewProd")
+    assert card.image == b"JPEG-BYTES"
+    assert scr.requested.count("https://x/card/2") == 1
+
+
+def test_iter_parse_with_process_pool():
+    sc = _offline_scraper()
+    try:
+        products = list(sc.iter_parse(INDEX_HTML))
+        # Forking the threaded scraper could deadlock the workers
+        assert sc._parse_pool._mp_context.get_start_method() != "fork"
+    finally:
+        sc.close()
+    assert [p.name for p in products] == [f"OP-0{i}" for i in range(1, PRODUCT_COUNT + 1)]
+    for product in products:
+        (card,) = product.cards
+        assert (card.name, card.rarity, card.number) == ("Card2", "SR", "OP01-002")
+        assert (card.price, card.quantity, card.feature, card.color) == (1200, 3, "特徴", "赤")
+        assert card.image == b"JPEG-BYTES"
+    # The card page is parsed once and reused by the later products
+    assert sc.requested.count("https://x/card/2") == 1
+
+
+def test_job_stops_when_writer_fails(tmp_path, monkeypatch):
+    failed = threading.Event()
+    parsed = []
+
+    def make_scraper(url, **kwargs):
+        sc = _offline_scraper(url)
+        sc.fetch = lambda: INDEX_HTML
+        parse_page = sc.parse_product_page
+
+        def parse_product_page(html, product=""):
+            cards = parse_page(html, product)
+            parsed.append(product)
+            if len(parsed) > 1:
+                # Let the writer record the failure of the first product
+                failed.wait(5)
+                time.sleep(0.05)
+            return cards
+
+        sc.parse_product_page = parse_product_page
+        return sc
+
+    def insert_products(self, products):
+        failed.set()
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(main, "Scraper", make_scraper)
+    monkeypatch.setattr(db_manager.DatabaseManager, "insert_products", insert_products)
+    job = main.create_job("https://x/top", str(tmp_path / "t.db"))
+    with pytest.raises(RuntimeError, match="disk full"):
+        job()
+    assert len(parsed) < PRODUCT_COUNT